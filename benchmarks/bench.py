@@ -0,0 +1,226 @@
+# benchmarks/bench.py
+"""
+Benchmarks des étapes de chargement, nettoyage et rendu des pages.
+
+Usage :
+    python -m benchmarks.bench --scales 1 10 100 1000 --output bench.json
+
+Chaque étape est mesurée (temps et pic mémoire Python via tracemalloc) sur des
+copies de travail dans un répertoire temporaire : data/ n'est jamais modifié.
+L'échelle 1 utilise les fichiers réels ; les échelles supérieures des fichiers
+générés par src/utils/synthetic_data.py (facteur × plus de pays).
+Le démarrage (registre, moteur de requêtes et classements pré-calculés,
+instantané de l'accueil) est mesuré une fois, sur sa propre ligne, avant les pages.
+Les pages sont exécutées sans serveur Streamlit (mode "bare" : les widgets
+renvoient leur valeur par défaut). Chaque répétition part de caches vides
+(figures, JSON, ordres de tri, cache disque neuf) et mesure le premier rendu
+(à froid, "secondes") puis un second rendu servi par les caches (à chaud,
+"secondes_chaud") ; on garde le minimum de chaque colonne.
+"""
+import argparse
+import contextlib
+import datetime
+import json
+import logging
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pandas as pd
+
+from src.components.charts import cache_figures
+from src.utils import disk_cache
+from src.utils.clean_data import RAW_DIR, clean_tourism_data
+from src.utils.get_data import load_raw_data
+from src.utils.load_cleaned_data import load_cleaned_data
+from src.utils.pagination import cache_ordres
+from src.utils.registry import registre_dashboard
+from src.utils.synthetic_data import generer_jeu
+
+DATASETS = ["frequentation_mensuelle", "frequentation_region", "frequentation_hoteliere"]
+SCALES = [1, 10, 100, 1000]
+
+# Cardinalités du fichier frequentation_region publié (9 pays × 222 mois ≈ 1 993 lignes)
+PAYS_REFERENCE = 9
+MOIS_REFERENCE = 222
+
+
+def mesurer(fn, *args, **kwargs):
+    """Exécute fn et renvoie (résultat, secondes, pic mémoire en Mo)"""
+    tracemalloc.start()
+    debut = time.perf_counter()
+    try:
+        resultat = fn(*args, **kwargs)
+    finally:
+        duree = time.perf_counter() - debut
+        _, pic = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return resultat, duree, pic / 2**20
+
+
+def serveur_local(repertoire):
+    """Serveur HTTP local servant les fichiers bruts (remplace data.gouv.fr)"""
+    handler = partial(SimpleHTTPRequestHandler, directory=str(repertoire))
+    handler.log_message = lambda *args: None
+    serveur = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    return serveur
+
+
+def vider_caches(cache_dir):
+    """Caches de rendu vidés et cache disque neuf dans cache_dir : le prochain rendu est à froid"""
+    cache_figures.clear()
+    cache_ordres.clear()
+    disk_cache.CACHE_DIR = Path(cache_dir)
+
+
+def demarrer(cleaned_dir):
+    """
+    Démarrage du dashboard, comme main.load_data : registre, moteur de requêtes
+    (classements pré-calculés compris) et instantané de la page d'accueil.
+    Payé une fois par processus, il n'entre pas dans le premier rendu des pages.
+    """
+    from src.pages.home import texte_accueil
+    registre = registre_dashboard(cleaned_dir)
+    registre["moteur"]
+    texte_accueil(registre)
+    return registre
+
+
+def pages():
+    from src.pages.economic import show_economic
+    from src.pages.home import show_home
+    from src.pages.international import show_international
+    from src.pages.regional import show_regional
+    return {
+        "show_home": show_home,
+        "show_regional": show_regional,
+        "show_international": show_international,
+        "show_economic": show_economic,
+    }
+
+
+def bench_echelle(facteur, workdir, repetitions=1, seed=0):
+    """Mesure toutes les étapes pour un facteur d'échelle donné"""
+    source = workdir / f"source_x{facteur}"
+    raw = workdir / f"raw_x{facteur}"
+    cleaned = workdir / f"cleaned_x{facteur}"
+    for d in (source, raw, cleaned):
+        d.mkdir()
+
+    if facteur == 1:
+        # Échelle de référence : les fichiers réels
+        for name in DATASETS:
+            shutil.copy(RAW_DIR / f"{name}.csv", source / f"{name}.csv")
+        lignes = len(pd.read_csv(RAW_DIR / "frequentation_region.csv", usecols=[0]))
+    else:
+        # Même historique, facteur × plus de pays d'origine
+        lignes = generer_jeu(source, n_pays=PAYS_REFERENCE * facteur,
+                             n_mois=MOIS_REFERENCE, seed=seed)
+
+    resultats = []
+
+    def ajouter(etape, secondes, pic, secondes_chaud=None):
+        resultat = {
+            "etape": etape,
+            "echelle": facteur,
+            "lignes_region": lignes,
+            "secondes": round(secondes, 4),
+            "pic_memoire_mo": round(pic, 2),
+        }
+        if secondes_chaud is not None:
+            resultat["secondes_chaud"] = round(secondes_chaud, 4)
+        resultats.append(resultat)
+
+    serveur = serveur_local(source)
+    try:
+        urls = {
+            name: f"http://127.0.0.1:{serveur.server_port}/{name}.csv"
+            for name in DATASETS
+        }
+        _, t, pic = mesurer(load_raw_data, urls, str(raw))
+        ajouter("load_raw_data", t, pic)
+    finally:
+        serveur.shutdown()
+
+    _, t, pic = mesurer(clean_tourism_data, raw, cleaned, force=True)
+    ajouter("clean_tourism_data", t, pic)
+
+    _, t, pic = mesurer(load_cleaned_data, cleaned)
+    ajouter("load_cleaned_data", t, pic)
+
+    df_dict, t, pic = mesurer(demarrer, cleaned)
+    ajouter("demarrage", t, pic)
+
+    for nom, page in pages().items():
+        froid, chaud = None, None
+        for i in range(repetitions):
+            vider_caches(workdir / f"cache_x{facteur}_{nom}_{i}")
+            _, t, pic = mesurer(page, df_dict)
+            froid = (t, pic) if froid is None or t < froid[0] else froid
+            _, t, _ = mesurer(page, df_dict)
+            chaud = t if chaud is None else min(chaud, t)
+        ajouter(nom, *froid, secondes_chaud=chaud)
+
+    return resultats
+
+
+def meta():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "plateforme": platform.platform(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks du dashboard tourisme")
+    parser.add_argument("--scales", type=int, nargs="+", default=SCALES,
+                        help="facteurs d'échelle appliqués à frequentation_region")
+    parser.add_argument("--repetitions", type=int, default=3,
+                        help="nombre de rendus à froid, puis à chaud, par page (on garde les plus rapides)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="graine du générateur de données synthétiques")
+    parser.add_argument("--output", help="fichier JSON de sortie (sinon stdout)")
+    args = parser.parse_args(argv)
+
+    # Pas de serveur Streamlit : on coupe l'avertissement répété du mode "bare"
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").disabled = True
+
+    # Les étapes mesurées écrivent leur progression sur stdout : on la renvoie sur stderr
+    resultats = []
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(sys.stderr):
+        # Cache disque des résultats dans le répertoire temporaire, lui aussi
+        disk_cache.CACHE_DIR = Path(tmp) / "cache"
+        for facteur in args.scales:
+            print(f"Échelle x{facteur}...", file=sys.stderr)
+            resultats.extend(bench_echelle(facteur, Path(tmp), args.repetitions, args.seed))
+
+    rapport = {"meta": meta(), "resultats": resultats}
+    texte = json.dumps(rapport, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(texte + "\n", encoding="utf-8")
+    else:
+        print(texte)
+    return rapport
+
+
+if __name__ == "__main__":
+    main()
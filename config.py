@@ -0,0 +1,10 @@
+# config.py
+
+# Moteur de requêtes des pages : "pandas" (cube en mémoire) ou "duckdb"
+# (SQL sur une copie Parquet des données, nécessite pip install duckdb)
+MOTEUR_REQUETES = "pandas"
+
+# Mesure des temps de rendu par section (journal data/metrics/latences.jsonl)
+INSTRUMENTATION = False
+# Port local de l'exporteur Prometheus (GET /metrics), None pour ne pas le démarrer
+PROMETHEUS_PORT = None
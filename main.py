@@ -1,15 +1,33 @@
 # main.py
 import streamlit as st
-from src.utils.load_cleaned_data import load_cleaned_data  # notre fonction corrigée
+import config
+from src.pages.home import texte_accueil
+from src.utils.clean_data import version_donnees
+from src.utils.instrumentation import activer, mesurer
+from src.utils.registry import registre_dashboard
 
 # -----------------------------
 # Chargement des données nettoyées
 # -----------------------------
-@st.cache_data
-def load_data():
-    return load_cleaned_data()
+# cache_resource : un seul exemplaire partagé, sans copie ni hachage à chaque rerun.
+# Les DataFrames sont typés et figés au chargement : les pages les lisent sans jamais les modifier.
+# La version des données fait partie de la clé : après un nouveau nettoyage, le rerun suivant
+# construit un nouveau registre (max_entries=1 libère l'ancien) au lieu de servir l'ancienne version.
+@st.cache_resource(max_entries=1)
+def load_data(version):
+    # Registre paresseux : chaque dataset (et le cube d'agrégats) est chargé
+    # au premier accès par une page, puis conservé
+    registre = registre_dashboard(moteur=config.MOTEUR_REQUETES)
+    # Page d'accueil pré-calculée dès le démarrage (relue du cache disque si déjà faite)
+    texte_accueil(registre)
+    return registre
 
-df_dict = load_data()  # df_dict contient les 3 fichiers nettoyés
+# Instrumentation des temps de rendu (désactivée par défaut, voir config.py)
+if config.INSTRUMENTATION:
+    activer(port=config.PROMETHEUS_PORT)
+
+with mesurer("main", "load_data"):
+    df_dict = load_data(version_donnees())  # df_dict donne accès aux 3 fichiers nettoyés, au cube d'agrégats et au moteur de requêtes
 
 # -----------------------------
 # Navigation multi-pages
@@ -0,0 +1,58 @@
+# report.py
+"""
+Briefings statiques : rend les graphiques des pages pour une liste de
+scénarios de filtres, sans Streamlit, sur un pool de processus.
+
+    python report.py scenarios.json --sortie data/rapports
+    python report.py --par-region --debut 2024-01 --fin 2024-12 --format png
+
+Voir src/utils/rapports.py pour le format des scénarios.
+"""
+import argparse
+import importlib.util
+import sys
+import time
+
+from src.utils import rapports
+from src.utils.aggregates import TOURISTES
+from src.utils.registry import registre_dashboard
+
+SORTIE = "data/rapports"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendu des briefings par scénario de filtres")
+    parser.add_argument("scenarios", nargs="?", help="fichier JSON : liste de scénarios")
+    parser.add_argument("--par-region", action="store_true",
+                        help="un scénario par région (à la place du fichier)")
+    parser.add_argument("--debut", help="début de période (AAAA-MM) pour --par-region")
+    parser.add_argument("--fin", help="fin de période (AAAA-MM) pour --par-region")
+    parser.add_argument("--metric", default=TOURISTES, choices=rapports.METRIQUES)
+    parser.add_argument("--sortie", default=SORTIE, help=f"répertoire de sortie (défaut : {SORTIE})")
+    parser.add_argument("--format", default="html", choices=rapports.FORMATS)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="nombre de processus (défaut : nombre de cœurs)")
+    args = parser.parse_args(argv)
+
+    if args.format == "png" and importlib.util.find_spec("kaleido") is None:
+        parser.error("le format png nécessite kaleido (pip install kaleido)")
+    if not args.scenarios and not args.par_region:
+        parser.error("indiquer un fichier de scénarios ou --par-region")
+
+    registre = registre_dashboard()
+    if args.par_region:
+        regions = registre["moteur"].valeurs("Region")
+        scenarios = rapports.scenarios_par_region(regions, args.debut, args.fin, args.metric)
+    else:
+        scenarios = rapports.lire_scenarios(args.scenarios)
+
+    print(f"{len(scenarios)} scénarios → {args.sortie} ({args.format})")
+    debut = time.perf_counter()
+    resultats = rapports.rendre_scenarios(registre, scenarios, args.sortie, args.format, args.workers)
+    nb_figures = sum(n for _, n, _ in resultats)
+    print(f" {nb_figures} figures rendues en {time.perf_counter() - debut:.1f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+# src/components/charts.py
+"""
+Mise en cache des figures Plotly des pages.
+
+Les pages décrivent chaque graphique par une fonction pure
+`builder(moteur, filtres, **options) -> go.Figure` : elle interroge le moteur
+de requêtes (agrégats filtrés) et construit la figure, sans appel à Streamlit (None s'il n'y a rien à tracer). afficher_figure mémorise le
+JSON de la figure sous la clé (builder, version des données, filtres, options) ;
+à chaque rerun, seuls les graphiques dont un paramètre a changé sont recalculés.
+Le JSON est aussi écrit dans le cache disque, partagé par les autres workers.
+json_memorise applique le même mécanisme à tout résultat sérialisé en JSON
+(instantané de la page d'accueil).
+"""
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from src.utils.cache import CacheLRU
+from src.utils.disk_cache import cache_disque, empreinte
+from src.utils.instrumentation import compter
+
+# Bornes du cache partagé par toutes les sessions
+FIGURES_MAX_ENTREES = 256
+FIGURES_MAX_OCTETS = 64 * 2**20
+
+cache_figures = CacheLRU(FIGURES_MAX_ENTREES, FIGURES_MAX_OCTETS, taille=len)
+
+
+def _figeable(valeur):
+    """Valeur utilisable dans une clé de cache (listes et dicts → tuples)"""
+    if isinstance(valeur, dict):
+        return tuple(sorted((k, _figeable(v)) for k, v in valeur.items()))
+    if isinstance(valeur, (list, tuple, set)):
+        return tuple(_figeable(v) for v in valeur)
+    return valeur
+
+
+def cle_figure(builder, version, filtres=None, **options):
+    return (
+        f"{builder.__module__}.{builder.__qualname__}",
+        version,
+        _figeable(filtres or {}),
+        _figeable(options),
+    )
+
+
+def json_memorise(cle, version, calcul):
+    """
+    Texte JSON mémorisé sous `cle` (cache en mémoire, puis cache disque),
+    produit par `calcul()` au premier appel. Sans version de données, pas de cache.
+    """
+    if version is None:
+        return calcul()
+
+    texte = cache_figures.get(cle)
+    if texte is not None:
+        return texte
+
+    disque = cache_disque()
+    if disque is not None:
+        valeur = disque.get(empreinte(*cle), version)
+        if valeur is not None:
+            texte = valeur.decode("utf-8")
+            cache_figures.set(cle, texte)
+            return texte
+
+    texte = calcul()
+    cache_figures.set(cle, texte)
+    if disque is not None:
+        disque.set(empreinte(*cle), version, texte.encode("utf-8"))
+    return texte
+
+
+def figure_json(builder, version, moteur, filtres=None, **options):
+    """
+    JSON de la figure, calculé au premier appel pour une clé donnée
+    ("" si le builder n'a rien à tracer)
+    """
+    def calcul():
+        fig = builder(moteur, filtres or {}, **options)
+        return fig.to_json() if fig is not None else ""
+
+    return json_memorise(cle_figure(builder, version, filtres, **options), version, calcul)
+
+
+def normaliser_au_max(df, colonnes):
+    """
+    Matrice (lignes × colonnes) des valeurs rapportées au maximum de leur
+    colonne, sur une échelle 0-100 (0 pour une colonne sans maximum positif)
+    """
+    valeurs = df[colonnes].to_numpy(dtype="float64")
+    maxima = df[colonnes].max().to_numpy(dtype="float64")
+    echelle = np.divide(100.0, maxima, out=np.zeros_like(maxima), where=maxima > 0)
+    return valeurs * echelle
+
+
+def traces_radar(df, noms, colonnes, etiquettes=None):
+    """
+    Une trace Scatterpolar par ligne de df (nommée par la colonne `noms`),
+    sur les `colonnes` normalisées au maximum : toute la normalisation est
+    faite en une opération, les traces en un seul passage
+    """
+    r = normaliser_au_max(df, colonnes)
+    # Polygone fermé : le premier axe est répété en fin de tracé
+    r = np.column_stack([r, r[:, :1]])
+    theta = list(etiquettes or colonnes)
+    theta.append(theta[0])
+    return [go.Scatterpolar(r=ligne, theta=theta, fill='toself', name=nom)
+            for nom, ligne in zip(df[noms], r)]
+
+
+def afficher_figure(builder, version, moteur, filtres=None, **options):
+    """Affiche la figure mémorisée (la recalcule si besoin) ; False si rien à tracer"""
+    return afficher_json(figure_json(builder, version, moteur, filtres, **options))
+
+
+def afficher_json(texte):
+    """Affiche une figure déjà sérialisée (JSON Plotly) ; False si rien à tracer"""
+    if not texte:
+        return False
+    compter(octets=len(texte))
+    # Le JSON provient d'une figure déjà validée par Plotly : pas de seconde validation
+    fig = go.Figure(json.loads(texte), _validate=False)
+    st.plotly_chart(fig, use_container_width=True)
+    return True
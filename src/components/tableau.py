@@ -0,0 +1,34 @@
+# src/components/tableau.py
+import streamlit as st
+
+LIGNES_PAR_PAGE = 100
+
+
+def tableau_pagine(nb_lignes, lire_page, key, colonnes=None,
+                   lignes_par_page=LIGNES_PAR_PAGE, height=400):
+    """
+    Tableau trié et paginé côté serveur : seule la page affichée est lue et
+    envoyée au navigateur. `lire_page(debut, fin)` renvoie les lignes
+    [debut, fin[ déjà triées (pagination.page_triee sur un DataFrame, ou
+    moteur.page_lignes) ; `nb_lignes` est la taille de la sélection.
+    """
+    nb_pages = max(1, -(-nb_lignes // lignes_par_page))
+    cle_page = f"{key}_page"
+    # Filtres resserrés : la page mémorisée peut ne plus exister
+    if st.session_state.get(cle_page, 1) > nb_pages:
+        st.session_state[cle_page] = nb_pages
+
+    col_page, col_info = st.columns([1, 3])
+    with col_page:
+        page = st.number_input("Page", min_value=1, max_value=nb_pages, step=1, key=cle_page)
+    debut = (int(page) - 1) * lignes_par_page
+    fin = min(debut + lignes_par_page, nb_lignes)
+    with col_info:
+        st.caption(f"Lignes {min(debut + 1, fin)}–{fin} sur {nb_lignes:,} ({nb_pages} pages)")
+
+    df_page = lire_page(debut, fin)
+    st.dataframe(
+        df_page if colonnes is None else df_page[colonnes],
+        use_container_width=True,
+        height=height
+    )
@@ -0,0 +1,22 @@
+# src/components/telechargement.py
+import streamlit as st
+
+from src.utils.export import FORMATS_EXPORT, fichier_export
+
+
+def bouton_export(source, nom_fichier, label, key):
+    """
+    Choix du format et bouton de téléchargement. `source` : fonction sans
+    argument qui renvoie le DataFrame à exporter ; elle n'est appelée, et
+    l'export écrit, que lorsque l'utilisateur clique sur le bouton (data
+    callable de st.download_button, Streamlit >= 1.52).
+    """
+    format_ = st.selectbox("Format d'export", list(FORMATS_EXPORT), key=f"{key}_format")
+    extension, mime = FORMATS_EXPORT[format_]
+    return st.download_button(
+        label=f"{label} ({format_})",
+        data=lambda: fichier_export(source(), format_),
+        file_name=f"{nom_fichier}{extension}",
+        mime=mime,
+        key=key,
+    )
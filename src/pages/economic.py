@@ -2,93 +2,17 @@
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-import pandas as pd
+from src.components.charts import afficher_figure
+from src.utils.downsampling import sous_echantillonner
+from src.utils.instrumentation import mesurer
 
-def show_economic(df_dict):
-    """
-    Analyse de l'impact économique du tourisme international
-    """
-    st.title("💼 Impact Économique du Tourisme")
-    st.markdown("Analyse des retombées économiques : nuitées, durée de séjour, intensité")
-    
-    # Récupération des données
-    df_region = df_dict["frequentation_region"]
-    df_hotel = df_dict.get("frequentation_hoteliere", df_region)
-    
-    # Conversion date
-    if 'Mois' in df_region.columns:
-        df_region['Mois'] = pd.to_datetime(df_region['Mois'])
-    
-    # ========================================
-    # FILTRES
-    # ========================================
-    st.sidebar.title("🎛️ Filtres")
-    
-    regions_dispo = ['Tous'] + sorted(df_region['Region'].unique().tolist())
-    region_filter = st.sidebar.selectbox("Région d'origine", regions_dispo)
-    
-    if region_filter != 'Tous':
-        df_filtered = df_region[df_region['Region'] == region_filter].copy()
-    else:
-        df_filtered = df_region.copy()
-    
-    # ========================================
-    # INDICATEURS ÉCONOMIQUES CLÉS
-    # ========================================
-    st.header("📊 Indicateurs Économiques Clés")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    total_nuitees = df_filtered['Nuitées touristiques'].sum()
-    total_touristes = df_filtered['Nombre de touristes'].sum()
-    duree_moy = df_filtered['Durée de séjour moyenne'].mean()
-    intensite = total_nuitees / total_touristes if total_touristes > 0 else 0
-    
-    with col1:
-        st.metric(
-            "🏨 Nuitées Totales",
-            f"{total_nuitees/1000:.1f}M",
-            help="Volume total de nuitées touristiques"
-        )
-    
-    with col2:
-        st.metric(
-            "👥 Touristes",
-            f"{total_touristes/1000:.1f}M",
-            help="Nombre total d'arrivées"
-        )
-    
-    with col3:
-        st.metric(
-            "⏱️ Séjour Moyen",
-            f"{duree_moy:.1f} jours",
-            help="Durée moyenne de séjour"
-        )
-    
-    with col4:
-        st.metric(
-            "📈 Intensité",
-            f"{intensite:.1f}",
-            help="Nuitées par touriste (indicateur d'intensité économique)"
-        )
-    
-    # ========================================
-    # GRAPHIQUE : RATIO NUITÉES/TOURISTES
-    # ========================================
-    st.markdown("---")
-    st.header("💰 Rentabilité Économique par Région")
-    
-    st.markdown("""
-    **L'intensité économique** mesure le nombre de nuitées générées par touriste.  
-    Plus ce ratio est élevé, plus l'impact économique est important.
-    """)
-    
+
+# ========================================
+# CONSTRUCTION DES GRAPHIQUES (fonctions pures, mises en cache par afficher_figure)
+# ========================================
+def fig_intensite_regions(moteur, filtres):
     # Calcul par région
-    df_ratio = df_filtered.groupby('Region', as_index=False).agg({
-        'Nombre de touristes': 'sum',
-        'Nuitées touristiques': 'sum',
-        'Durée de séjour moyenne': 'mean'
-    })
+    df_ratio = moteur.agreger('Region', filtres)
     
     df_ratio['Intensité économique'] = df_ratio['Nuitées touristiques'] / df_ratio['Nombre de touristes']
     df_ratio = df_ratio.sort_values('Intensité économique', ascending=False)
@@ -111,303 +35,378 @@ def show_economic(df_dict):
         height=400,
         xaxis_title="Nuitées par touriste"
     )
+    return fig_ratio
+
+
+def fig_volume_duree(moteur, filtres):
+    # Agrégation par pays
+    # Top 20 pays pour lisibilité (préfixe du classement pré-calculé)
+    df_scatter = moteur.classements.top('Pays', 'Nombre de touristes', 20, filtres, attributs=['Region'])
+    
+    fig_scatter = px.scatter(
+        df_scatter,
+        x='Nombre de touristes',
+        y='Durée de séjour moyenne',
+        size='Nuitées touristiques',
+        color='Region',
+        hover_name='Pays',
+        hover_data={
+            'Nombre de touristes': ':,.0f',
+            'Nuitées touristiques': ':,.0f',
+            'Durée de séjour moyenne': ':.1f'
+        },
+        title="Volume de touristes vs Durée moyenne de séjour",
+        labels={
+            'Nombre de touristes': 'Volume de touristes (milliers)',
+            'Durée de séjour moyenne': 'Durée de séjour (jours)'
+        }
+    )
     
-    st.plotly_chart(fig_ratio, use_container_width=True)
+    # Lignes de référence
+    median_touristes = df_scatter['Nombre de touristes'].median()
+    median_duree = df_scatter['Durée de séjour moyenne'].median()
     
-    # ========================================
-    # SCATTER : VOLUME VS DURÉE
-    # ========================================
-    st.markdown("---")
-    st.header("🎯 Volume vs Qualité du Séjour")
+    fig_scatter.add_hline(
+        y=median_duree, 
+        line_dash="dash", 
+        line_color="gray",
+        annotation_text="Durée médiane"
+    )
+    fig_scatter.add_vline(
+        x=median_touristes,
+        line_dash="dash",
+        line_color="gray",
+        annotation_text="Volume médian"
+    )
     
-    col1, col2 = st.columns([2, 1])
+    fig_scatter.update_layout(height=500)
+    return fig_scatter
+
+
+def fig_evolution_intensite(moteur, filtres):
+    # Calcul mensuel
+    df_monthly = moteur.agreger('Mois', filtres)
+    
+    df_monthly['Intensité'] = df_monthly['Nuitées touristiques'] / df_monthly['Nombre de touristes']
+    
+    # Au plus POINTS_PAR_SERIE mois, les mêmes pour les deux axes
+    df_monthly = sous_echantillonner(df_monthly, 'Mois', ['Nuitées touristiques', 'Intensité'])
+    
+    # Graphique double axe
+    fig_evolution = go.Figure()
+    
+    # Nuitées (axe gauche)
+    fig_evolution.add_trace(go.Bar(
+        x=df_monthly['Mois'],
+        y=df_monthly['Nuitées touristiques'],
+        name='Nuitées',
+        marker_color='lightblue',
+        yaxis='y'
+    ))
+    
+    # Intensité (axe droit)
+    fig_evolution.add_trace(go.Scatter(
+        x=df_monthly['Mois'],
+        y=df_monthly['Intensité'],
+        name='Intensité économique',
+        line=dict(color='red', width=3),
+        mode='lines+markers',
+        yaxis='y2'
+    ))
+    
+    fig_evolution.update_layout(
+        title="Évolution des nuitées et de l'intensité économique",
+        xaxis_title="Mois",
+        yaxis=dict(title="Nuitées (milliers)", side='left'),
+        yaxis2=dict(title="Intensité (nuitées/touriste)", side='right', overlaying='y'),
+        hovermode='x unified',
+        height=400,
+        legend=dict(x=0.01, y=0.99)
+    )
+    return fig_evolution
+
+
+def fig_classement_pays(moteur, filtres, col_sort, critere, top_n):
+    # Classement par pays (avec l'intensité économique) pré-calculé : top_n en est un préfixe
+    df_top = moteur.classements.top('Pays', col_sort, top_n, filtres)
+    
+    fig_classement = px.bar(
+        df_top.sort_values(col_sort, ascending=True),
+        x=col_sort,
+        y='Pays',
+        orientation='h',
+        color=col_sort,
+        color_continuous_scale='Viridis',
+        text=col_sort,
+        title=f"Top {top_n} pays - {critere}"
+    )
     
-    with col2:
-        st.markdown("""
-        ### 📖 Interprétation
-        
-        **Quadrant supérieur droit** 🟢  
-        → Volume ET durée élevés  
-        → Marchés à fort potentiel
-        
-        **Quadrant supérieur gauche** 🟡  
-        → Faible volume mais longue durée  
-        → Marchés de niche à développer
-        
-        **Quadrant inférieur droit** 🟠  
-        → Volume élevé mais courte durée  
-        → Optimiser la durée de séjour
-        
-        **Quadrant inférieur gauche** 🔴  
-        → Faible volume ET courte durée  
-        → Marchés à faible priorité
-        """)
+    fig_classement.update_traces(
+        texttemplate='%{text:,.1f}',
+        textposition='outside'
+    )
+    fig_classement.update_layout(showlegend=False, height=450)
+    return fig_classement
+
+
+def fig_comparaison_pays(moteur, filtres, pays):
+    df_compare_agg = moteur.agreger('Pays', {**filtres, 'pays': pays})
+    
+    # Graphique en barres groupées
+    fig_compare = go.Figure()
+    
+    fig_compare.add_trace(go.Bar(
+        name='Touristes (milliers)',
+        x=df_compare_agg['Pays'],
+        y=df_compare_agg['Nombre de touristes'],
+        marker_color='lightblue'
+    ))
+    
+    fig_compare.add_trace(go.Bar(
+        name='Nuitées (milliers)',
+        x=df_compare_agg['Pays'],
+        y=df_compare_agg['Nuitées touristiques'],
+        marker_color='lightcoral'
+    ))
+    
+    fig_compare.update_layout(
+        title="Comparaison : Touristes vs Nuitées",
+        barmode='group',
+        height=400,
+        xaxis_title="",
+        yaxis_title="Volume (milliers)"
+    )
+    return fig_compare
+
+
+def show_economic(df_dict):
+    """
+    Analyse de l'impact économique du tourisme international
+    """
+    st.title("💼 Impact Économique du Tourisme")
+    st.markdown("Analyse des retombées économiques : nuitées, durée de séjour, intensité")
     
-    with col1:
-        # Agrégation par pays
-        df_scatter = df_filtered.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Durée de séjour moyenne': 'mean',
-            'Nuitées touristiques': 'sum',
-            'Region': 'first'
-        })
-        
-        # Top 20 pays pour lisibilité
-        df_scatter = df_scatter.nlargest(20, 'Nombre de touristes')
-        
-        fig_scatter = px.scatter(
-            df_scatter,
-            x='Nombre de touristes',
-            y='Durée de séjour moyenne',
-            size='Nuitées touristiques',
-            color='Region',
-            hover_name='Pays',
-            hover_data={
-                'Nombre de touristes': ':,.0f',
-                'Nuitées touristiques': ':,.0f',
-                'Durée de séjour moyenne': ':.1f'
-            },
-            title="Volume de touristes vs Durée moyenne de séjour",
-            labels={
-                'Nombre de touristes': 'Volume de touristes (milliers)',
-                'Durée de séjour moyenne': 'Durée de séjour (jours)'
-            }
-        )
-        
-        # Lignes de référence
-        median_touristes = df_scatter['Nombre de touristes'].median()
-        median_duree = df_scatter['Durée de séjour moyenne'].median()
-        
-        fig_scatter.add_hline(
-            y=median_duree, 
-            line_dash="dash", 
-            line_color="gray",
-            annotation_text="Durée médiane"
-        )
-        fig_scatter.add_vline(
-            x=median_touristes,
-            line_dash="dash",
-            line_color="gray",
-            annotation_text="Volume médian"
-        )
+    # Récupération des données
+    moteur = df_dict["moteur"]
+    version = getattr(df_dict, "version", None)
+    
+    # ========================================
+    # FILTRES
+    # ========================================
+    with mesurer("economic", "filtres"):
+        st.sidebar.title("🎛️ Filtres")
         
-        fig_scatter.update_layout(height=500)
+        regions_dispo = ['Tous'] + moteur.valeurs('Region')
+        region_filter = st.sidebar.selectbox("Région d'origine", regions_dispo)
         
-        st.plotly_chart(fig_scatter, use_container_width=True)
+        filtres = {}
+        if region_filter != 'Tous':
+            filtres["regions"] = [region_filter]
     
     # ========================================
-    # ÉVOLUTION DE L'INTENSITÉ ÉCONOMIQUE
+    # INDICATEURS ÉCONOMIQUES CLÉS
+    # ========================================
+    with mesurer("economic", "indicateurs économiques clés"):
+        st.header("📊 Indicateurs Économiques Clés")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        
+        kpis = moteur.totaux(filtres)
+        total_nuitees = kpis['Nuitées touristiques']
+        total_touristes = kpis['Nombre de touristes']
+        duree_moy = kpis['Durée de séjour moyenne']
+        intensite = total_nuitees / total_touristes if total_touristes > 0 else 0
+        
+        with col1:
+            st.metric(
+                "🏨 Nuitées Totales",
+                f"{total_nuitees/1000:.1f}M",
+                help="Volume total de nuitées touristiques"
+            )
+        
+        with col2:
+            st.metric(
+                "👥 Touristes",
+                f"{total_touristes/1000:.1f}M",
+                help="Nombre total d'arrivées"
+            )
+        
+        with col3:
+            st.metric(
+                "⏱️ Séjour Moyen",
+                f"{duree_moy:.1f} jours",
+                help="Durée moyenne de séjour"
+            )
+        
+        with col4:
+            st.metric(
+                "📈 Intensité",
+                f"{intensite:.1f}",
+                help="Nuitées par touriste (indicateur d'intensité économique)"
+            )
+    
+    # ========================================
+    # GRAPHIQUE : RATIO NUITÉES/TOURISTES
     # ========================================
-    if 'Mois' in df_filtered.columns:
+    with mesurer("economic", "graphique : ratio nuitées/touristes"):
         st.markdown("---")
-        st.header("📈 Évolution de l'Impact Économique")
-        
-        # Calcul mensuel
-        df_monthly = df_filtered.groupby('Mois', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        df_monthly['Intensité'] = df_monthly['Nuitées touristiques'] / df_monthly['Nombre de touristes']
+        st.header("💰 Rentabilité Économique par Région")
         
-        # Graphique double axe
-        fig_evolution = go.Figure()
+        st.markdown("""
+        **L'intensité économique** mesure le nombre de nuitées générées par touriste.  
+        Plus ce ratio est élevé, plus l'impact économique est important.
+        """)
         
-        # Nuitées (axe gauche)
-        fig_evolution.add_trace(go.Bar(
-            x=df_monthly['Mois'],
-            y=df_monthly['Nuitées touristiques'],
-            name='Nuitées',
-            marker_color='lightblue',
-            yaxis='y'
-        ))
+        afficher_figure(fig_intensite_regions, version, moteur, filtres)
+    
+    # ========================================
+    # SCATTER : VOLUME VS DURÉE
+    # ========================================
+    with mesurer("economic", "scatter : volume vs durée"):
+        st.markdown("---")
+        st.header("🎯 Volume vs Qualité du Séjour")
         
-        # Intensité (axe droit)
-        fig_evolution.add_trace(go.Scatter(
-            x=df_monthly['Mois'],
-            y=df_monthly['Intensité'],
-            name='Intensité économique',
-            line=dict(color='red', width=3),
-            mode='lines+markers',
-            yaxis='y2'
-        ))
+        col1, col2 = st.columns([2, 1])
         
-        fig_evolution.update_layout(
-            title="Évolution des nuitées et de l'intensité économique",
-            xaxis_title="Mois",
-            yaxis=dict(title="Nuitées (milliers)", side='left'),
-            yaxis2=dict(title="Intensité (nuitées/touriste)", side='right', overlaying='y'),
-            hovermode='x unified',
-            height=400,
-            legend=dict(x=0.01, y=0.99)
-        )
+        with col2:
+            st.markdown("""
+            ### 📖 Interprétation
+            
+            **Quadrant supérieur droit** 🟢  
+            → Volume ET durée élevés  
+            → Marchés à fort potentiel
+            
+            **Quadrant supérieur gauche** 🟡  
+            → Faible volume mais longue durée  
+            → Marchés de niche à développer
+            
+            **Quadrant inférieur droit** 🟠  
+            → Volume élevé mais courte durée  
+            → Optimiser la durée de séjour
+            
+            **Quadrant inférieur gauche** 🔴  
+            → Faible volume ET courte durée  
+            → Marchés à faible priorité
+            """)
         
-        st.plotly_chart(fig_evolution, use_container_width=True)
+        with col1:
+            afficher_figure(fig_volume_duree, version, moteur, filtres)
     
     # ========================================
-    # CLASSEMENT PAR IMPACT ÉCONOMIQUE
+    # ÉVOLUTION DE L'INTENSITÉ ÉCONOMIQUE
     # ========================================
-    st.markdown("---")
-    st.header("🏆 Classement par Impact Économique")
-    
-    col_a, col_b = st.columns([1, 2])
-    
-    with col_a:
-        critere = st.radio(
-            "Critère de classement",
-            ["Nuitées totales", "Intensité économique", "Durée de séjour"]
-        )
-        
-        top_n = st.slider("Nombre de pays", 5, 20, 10)
+    with mesurer("economic", "évolution de l'intensité économique"):
+        if 'Mois' in moteur.colonnes:
+            st.markdown("---")
+            st.header("📈 Évolution de l'Impact Économique")
+            
+            afficher_figure(fig_evolution_intensite, version, moteur, filtres)
     
-    with col_b:
-        # Mapping des critères
-        critere_map = {
-            "Nuitées totales": "Nuitées touristiques",
-            "Intensité économique": "Intensité économique",
-            "Durée de séjour": "Durée de séjour moyenne"
-        }
-        
-        col_sort = critere_map[critere]
-        
-        # Préparation données
-        df_classement = df_filtered.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        df_classement['Intensité économique'] = (
-            df_classement['Nuitées touristiques'] / df_classement['Nombre de touristes']
-        )
-        
-        df_top = df_classement.nlargest(top_n, col_sort)
-        
-        fig_classement = px.bar(
-            df_top.sort_values(col_sort, ascending=True),
-            x=col_sort,
-            y='Pays',
-            orientation='h',
-            color=col_sort,
-            color_continuous_scale='Viridis',
-            text=col_sort,
-            title=f"Top {top_n} pays - {critere}"
-        )
+    # ========================================
+    # CLASSEMENT PAR IMPACT ÉCONOMIQUE
+    # ========================================
+    with mesurer("economic", "classement par impact économique"):
+        st.markdown("---")
+        st.header("🏆 Classement par Impact Économique")
         
-        fig_classement.update_traces(
-            texttemplate='%{text:,.1f}',
-            textposition='outside'
-        )
-        fig_classement.update_layout(showlegend=False, height=450)
+        col_a, col_b = st.columns([1, 2])
         
-        st.plotly_chart(fig_classement, use_container_width=True)
+        with col_a:
+            critere = st.radio(
+                "Critère de classement",
+                ["Nuitées totales", "Intensité économique", "Durée de séjour"]
+            )
+            
+            top_n = st.slider("Nombre de pays", 5, 20, 10)
+        
+        with col_b:
+            # Mapping des critères
+            critere_map = {
+                "Nuitées totales": "Nuitées touristiques",
+                "Intensité économique": "Intensité économique",
+                "Durée de séjour": "Durée de séjour moyenne"
+            }
+            
+            col_sort = critere_map[critere]
+            
+            afficher_figure(fig_classement_pays, version, moteur, filtres,
+                            col_sort=col_sort, critere=critere, top_n=top_n)
     
     # ========================================
     # ANALYSE COMPARATIVE
     # ========================================
-    st.markdown("---")
-    st.header("⚖️ Analyse Comparative")
-    
-    st.markdown("Comparez l'impact économique de différents marchés")
-    
-    pays_dispo = sorted(df_filtered['Pays'].unique())
-    pays_comparer = st.multiselect(
-        "Sélectionnez des pays à comparer",
-        options=pays_dispo,
-        default=pays_dispo[:5] if len(pays_dispo) >= 5 else pays_dispo
-    )
-    
-    if pays_comparer:
-        df_compare = df_filtered[df_filtered['Pays'].isin(pays_comparer)]
-        
-        df_compare_agg = df_compare.groupby('Pays', as_index=False).agg({
-            'Nombre de touristes': 'sum',
-            'Nuitées touristiques': 'sum',
-            'Durée de séjour moyenne': 'mean'
-        })
-        
-        # Graphique en barres groupées
-        fig_compare = go.Figure()
-        
-        fig_compare.add_trace(go.Bar(
-            name='Touristes (milliers)',
-            x=df_compare_agg['Pays'],
-            y=df_compare_agg['Nombre de touristes'],
-            marker_color='lightblue'
-        ))
-        
-        fig_compare.add_trace(go.Bar(
-            name='Nuitées (milliers)',
-            x=df_compare_agg['Pays'],
-            y=df_compare_agg['Nuitées touristiques'],
-            marker_color='lightcoral'
-        ))
-        
-        fig_compare.update_layout(
-            title="Comparaison : Touristes vs Nuitées",
-            barmode='group',
-            height=400,
-            xaxis_title="",
-            yaxis_title="Volume (milliers)"
-        )
-        
-        st.plotly_chart(fig_compare, use_container_width=True)
+    with mesurer("economic", "analyse comparative"):
+        st.markdown("---")
+        st.header("⚖️ Analyse Comparative")
         
-        # Tableau récapitulatif
-        st.subheader("📋 Tableau récapitulatif")
+        st.markdown("Comparez l'impact économique de différents marchés")
         
-        df_compare_agg['Intensité'] = (
-            df_compare_agg['Nuitées touristiques'] / df_compare_agg['Nombre de touristes']
+        pays_dispo = moteur.valeurs('Pays', filtres)
+        pays_comparer = st.multiselect(
+            "Sélectionnez des pays à comparer",
+            options=pays_dispo,
+            default=pays_dispo[:5] if len(pays_dispo) >= 5 else pays_dispo
         )
         
-        st.dataframe(
-            df_compare_agg.style.format({
-                'Nombre de touristes': '{:,.0f}',
-                'Nuitées touristiques': '{:,.0f}',
-                'Durée de séjour moyenne': '{:.1f}',
-                'Intensité': '{:.1f}'
-            }),
-            use_container_width=True
-        )
+        if pays_comparer:
+            afficher_figure(fig_comparaison_pays, version, moteur, filtres, pays=pays_comparer)
+            
+            df_compare_agg = moteur.agreger('Pays', {**filtres, 'pays': pays_comparer})
+            
+            # Tableau récapitulatif
+            st.subheader("📋 Tableau récapitulatif")
+            
+            df_compare_agg['Intensité'] = (
+                df_compare_agg['Nuitées touristiques'] / df_compare_agg['Nombre de touristes']
+            )
+            
+            st.dataframe(
+                df_compare_agg.style.format({
+                    'Nombre de touristes': '{:,.0f}',
+                    'Nuitées touristiques': '{:,.0f}',
+                    'Durée de séjour moyenne': '{:.1f}',
+                    'Intensité': '{:.1f}'
+                }),
+                use_container_width=True
+            )
     
     # ========================================
     # INSIGHTS STRATÉGIQUES
     # ========================================
-    st.markdown("---")
-    st.header("💡 Insights Stratégiques")
-    
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        # Pays à plus forte intensité
-        df_top_intensite = df_classement.nlargest(3, 'Intensité économique')
-        
-        st.success(f"""
-        **🎯 Marchés à forte intensité économique**
-        
-        Ces pays génèrent le plus de nuitées par touriste :
-        
-        {chr(10).join([f"- **{row['Pays']}** : {row['Intensité économique']:.1f} nuitées/touriste" 
-                       for _, row in df_top_intensite.iterrows()])}
+    with mesurer("economic", "insights stratégiques"):
+        st.markdown("---")
+        st.header("💡 Insights Stratégiques")
         
-        → Priorité : fidéliser ces marchés
-        """)
-    
-    with col2:
-        # Pays à améliorer
-        df_faible_duree = df_classement[
-            df_classement['Nombre de touristes'] > df_classement['Nombre de touristes'].median()
-        ].nsmallest(3, 'Durée de séjour moyenne')
+        col1, col2 = st.columns(2)
         
-        if not df_faible_duree.empty:
-            st.warning(f"""
-            **📊 Marchés à potentiel d'amélioration**
-            
-            Ces marchés ont du volume mais une courte durée :
+        with col1:
+            # Pays à plus forte intensité
+            df_top_intensite = moteur.classements.top('Pays', 'Intensité économique', 3, filtres)
             
-            {chr(10).join([f"- **{row['Pays']}** : {row['Durée de séjour moyenne']:.1f} jours" 
-                           for _, row in df_faible_duree.iterrows()])}
+            marches = "\n".join(f"- **{row['Pays']}** : {row['Intensité économique']:.1f} nuitées/touriste"
+                                 for _, row in df_top_intensite.iterrows())
+            st.success(
+                "**🎯 Marchés à forte intensité économique**\n\n"
+                "Ces pays génèrent le plus de nuitées par touriste :\n\n"
+                f"{marches}\n\n"
+                "→ Priorité : fidéliser ces marchés"
+            )
+        
+        with col2:
+            # Pays à améliorer
+            # Durées croissantes (classement pré-calculé) parmi les pays au-dessus de la médiane
+            df_par_duree = moteur.classements.top('Pays', 'Durée de séjour moyenne', None, filtres,
+                                                  croissant=True)
+            mediane = moteur.classements.top('Pays', 'Nombre de touristes', None, filtres)[
+                'Nombre de touristes'].median()
+            df_faible_duree = df_par_duree[df_par_duree['Nombre de touristes'] > mediane].head(3)
             
-            → Opportunité : allonger les séjours
-            """)
\ No newline at end of file
+            if not df_faible_duree.empty:
+                marches = "\n".join(f"- **{row['Pays']}** : {row['Durée de séjour moyenne']:.1f} jours"
+                                     for _, row in df_faible_duree.iterrows())
+                st.warning(
+                    "**📊 Marchés à potentiel d'amélioration**\n\n"
+                    "Ces marchés ont du volume mais une courte durée :\n\n"
+                    f"{marches}\n\n"
+                    "→ Opportunité : allonger les séjours"
+                )
\ No newline at end of file
@@ -0,0 +1,101 @@
+# src/utils/aggregates.py
+import pandas as pd
+
+# Dimensions du cube et mesures additives
+DIMENSIONS = ["Mois", "Region", "Pays"]
+# Attributs portés par le cube (fonction de Pays)
+ATTRIBUTS = ["ISO3"]
+TOURISTES = "Nombre de touristes"
+NUITEES = "Nuitées touristiques"
+DUREE = "Durée de séjour moyenne"
+DUREE_SOMME = "duree_somme"
+DUREE_NB = "duree_nb"
+NB_LIGNES = "nb_lignes"
+MESURES = [TOURISTES, NUITEES, DUREE_SOMME, DUREE_NB, NB_LIGNES]
+
+
+def construire_cube(df):
+    """
+    Construit le cube (Mois × Region × Pays) à partir de frequentation_region.
+    Toutes les mesures sont additives : la durée moyenne est reconstruite
+    à partir de sa somme et de son nombre de valeurs renseignées.
+    """
+    dims = [d for d in DIMENSIONS if d in df.columns]
+    # Mesures sommées en float64 : les colonnes compactées (int16, float32...)
+    # déborderaient ou perdraient en précision
+    df = df.astype({col: "float64" for col in (TOURISTES, NUITEES, DUREE) if col in df.columns})
+    cube = df.groupby(dims, observed=True, as_index=False, sort=True).agg(**{
+        TOURISTES: (TOURISTES, "sum"),
+        NUITEES: (NUITEES, "sum"),
+        DUREE_SOMME: (DUREE, "sum"),
+        DUREE_NB: (DUREE, "count"),
+        NB_LIGNES: (TOURISTES, "size"),
+        **{col: (col, "first") for col in ATTRIBUTS if col in df.columns},
+    })
+    return cube
+
+
+def libelles_en_category(cube):
+    """Dimensions texte en category (une fusion de cubes aux catégories différentes les repasse en object)"""
+    for col in ["Region", "Pays", *ATTRIBUTS]:
+        if col in cube.columns and not isinstance(cube[col].dtype, pd.CategoricalDtype):
+            cube[col] = cube[col].astype("category")
+    return cube
+
+
+def replier_cube(cubes):
+    """
+    Cube unique à partir de cubes partiels (blocs successifs d'un même
+    fichier) : les mesures additives s'additionnent cellule par cellule
+    """
+    if len(cubes) == 1:
+        return cubes[0]
+    cube = pd.concat(cubes, ignore_index=True)
+    dims = [d for d in DIMENSIONS if d in cube.columns]
+    agg = {col: "sum" for col in MESURES}
+    agg.update({col: "first" for col in ATTRIBUTS if col in cube.columns})
+    repli = cube.groupby(dims, observed=True, as_index=False, sort=True).agg(agg)
+    return libelles_en_category(repli[cube.columns])
+
+
+def filtrer_cube(cube, regions=None, pays=None, debut=None, fin=None, annee=None):
+    """Sélectionne une tranche du cube (None = pas de filtre sur la dimension)"""
+    masque = pd.Series(True, index=cube.index)
+    if regions is not None:
+        masque &= cube["Region"].isin(regions)
+    if pays is not None:
+        masque &= cube["Pays"].isin(pays)
+    if debut is not None:
+        masque &= cube["Mois"] >= debut
+    if fin is not None:
+        masque &= cube["Mois"] <= fin
+    if annee is not None:
+        masque &= cube["Mois"].dt.year == annee
+    return cube[masque]
+
+
+def agreger(cube, by, attributs=()):
+    """
+    Agrège une tranche du cube selon `by` et renvoie les indicateurs des pages :
+    sommes des touristes et nuitées, durée de séjour moyenne.
+    `attributs` : colonnes descriptives reprises telles quelles (première valeur).
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    agg = {col: "sum" for col in MESURES}
+    agg.update({col: "first" for col in attributs})
+    df = cube.groupby(by, observed=True, as_index=False).agg(agg)
+    df[DUREE] = df[DUREE_SOMME] / df[DUREE_NB]
+    return df[by + [TOURISTES, NUITEES, DUREE] + list(attributs)]
+
+
+def totaux(cube):
+    """Indicateurs globaux d'une tranche du cube"""
+    duree_nb = cube[DUREE_NB].sum()
+    return {
+        TOURISTES: cube[TOURISTES].sum(),
+        NUITEES: cube[NUITEES].sum(),
+        DUREE: cube[DUREE_SOMME].sum() / duree_nb if duree_nb > 0 else float("nan"),
+        "nb_pays": cube["Pays"].nunique(),
+        "nb_regions": cube["Region"].nunique(),
+        "nb_lignes": cube[NB_LIGNES].sum(),
+    }
@@ -0,0 +1,60 @@
+# src/utils/cache.py
+import sys
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache mémoire borné en nombre d'entrées et en octets.
+    Les entrées les moins récemment utilisées sont évincées en premier.
+    Partagé entre les sessions Streamlit (threads) : accès protégés par un verrou.
+    """
+
+    def __init__(self, max_entrees, max_octets, taille=sys.getsizeof):
+        self.max_entrees = max_entrees
+        self.max_octets = max_octets
+        self._taille = taille
+        self._entrees = OrderedDict()
+        self._octets = 0
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, cle, defaut=None):
+        with self._verrou:
+            if cle not in self._entrees:
+                self.misses += 1
+                return defaut
+            self._entrees.move_to_end(cle)
+            self.hits += 1
+            return self._entrees[cle][0]
+
+    def set(self, cle, valeur):
+        taille = self._taille(valeur)
+        with self._verrou:
+            if cle in self._entrees:
+                self._octets -= self._entrees.pop(cle)[1]
+            if taille > self.max_octets:
+                # Plus grosse que tout le cache : on ne la garde pas
+                return
+            self._entrees[cle] = (valeur, taille)
+            self._octets += taille
+            while len(self._entrees) > self.max_entrees or self._octets > self.max_octets:
+                _, (_, t) = self._entrees.popitem(last=False)
+                self._octets -= t
+
+    def clear(self):
+        with self._verrou:
+            self._entrees.clear()
+            self._octets = 0
+
+    def __len__(self):
+        return len(self._entrees)
+
+    @property
+    def octets(self):
+        return self._octets
+
+    def stats(self):
+        return {"entrees": len(self), "octets": self._octets, "hits": self.hits, "misses": self.misses}
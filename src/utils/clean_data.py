@@ -1,7 +1,20 @@
 # src/utils/clean_data.py
+import hashlib
+import json
+import tempfile
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
 from pathlib import Path
 
+from src.utils.aggregates import construire_cube, replier_cube
+from src.utils.disk_cache import cache_disque
+from src.utils.reference import charger_referentiel, empreinte_referentiel, joindre_iso3
+from src.utils.schema import (NUMERIC_COLS, cumuler_stats, lire_csv, lire_csv_blocs,
+                              normaliser_schema, table_normalisee, trier_par_mois, typer_colonnes)
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 RAW_DIR = PROJECT_ROOT / "data" / "raw"
 CLEANED_DIR = PROJECT_ROOT / "data" / "cleaned"
@@ -14,63 +27,643 @@ FILES = {
     "frequentation_hoteliere.csv": "frequentation_hoteliere_cleaned.csv"
 }
 
-def clean_tourism_data():
+# Store colonnaire typé (Arrow IPC non compressé, lisible en memory-map)
+STORE_SUFFIX = ".arrow"
+
+# Manifeste des fichiers bruts déjà nettoyés.
+# Incrémenter PIPELINE_VERSION à chaque changement de la logique de nettoyage :
+# tous les fichiers seront alors re-nettoyés au prochain lancement.
+PIPELINE_VERSION = 5
+MANIFEST_FILE = "manifest.json"
+
+# Indicateurs exportés sans ".0" superflu ni perte de précision
+FLOAT_FORMAT = "%.15g"
+
+# Taille des blocs par défaut du mode streaming
+CHUNKSIZE = 500_000
+# Empreintes fusionnées par fenêtre dans l'ensemble des lignes vues (8 Mo)
+FENETRE_FUSION = 1 << 20
+
+# Cube d'agrégats (Mois × Region × Pays) persisté à côté des stores, tenu à jour
+# mois par mois à partir de frequentation_region (entrée "cube_region" du manifeste)
+CUBE_SOURCE = "frequentation_region.csv"
+CUBE_STORE = "cube_region" + STORE_SUFFIX
+# Fichiers de tranches ouverts à la fois pendant la construction du cube (une passe par paquet)
+CUBE_FICHIERS_OUVERTS = 256
+
+def store_path(cleaned_file, cleaned_dir=CLEANED_DIR):
+    """Chemin du store Arrow associé à un fichier CSV nettoyé"""
+    return Path(cleaned_dir) / Path(cleaned_file).with_suffix(STORE_SUFFIX).name
+
+
+# -----------------------------
+# Manifeste
+# -----------------------------
+def hash_fichier(path, bloc=1 << 20):
+    """Empreinte SHA-256 et taille d'un fichier, lu par blocs"""
+    sha = hashlib.sha256()
+    taille = 0
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(bloc)
+            if not data:
+                break
+            sha.update(data)
+            taille += len(data)
+    return sha.hexdigest(), taille
+
+
+def sommes_partitions(df):
+    """Somme (modulo 2^64) des empreintes de lignes de chaque partition mensuelle"""
+    digests = pd.util.hash_pandas_object(df, index=False)
+    return {str(mois): int(h) for mois, h in digests.groupby(df["Mois"].to_numpy()).sum().items()}
+
+
+def hash_partitions(df):
+    """Empreinte de chaque partition mensuelle (indépendante de l'ordre des lignes)"""
+    return {mois: f"{h:016x}" for mois, h in sommes_partitions(df).items()}
+
+
+def charger_manifest(cleaned_dir=CLEANED_DIR):
+    path = Path(cleaned_dir) / MANIFEST_FILE
+    if not path.exists():
+        return {"pipeline_version": None, "files": {}}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sauver_manifest(manifest, cleaned_dir=CLEANED_DIR):
+    path = Path(cleaned_dir) / MANIFEST_FILE
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    tmp.replace(path)
+
+
+def version_donnees(cleaned_dir=CLEANED_DIR):
+    """
+    Empreinte courte des données nettoyées, qui change à chaque nettoyage
+    (manifest, ou tailles et dates des fichiers nettoyés à défaut)
+    """
+    manifest = charger_manifest(cleaned_dir)
+    if not manifest["files"]:
+        manifest = {}
+        for cleaned_file in FILES.values():
+            for path in (store_path(cleaned_file, cleaned_dir), Path(cleaned_dir) / cleaned_file):
+                if path.exists():
+                    st = path.stat()
+                    manifest[str(path)] = [st.st_size, st.st_mtime_ns]
+    texte = json.dumps(manifest, sort_keys=True)
+    return hashlib.sha256(texte.encode("utf-8")).hexdigest()[:16]
+
+
+# -----------------------------
+# Nettoyage
+# -----------------------------
+def detecter_separateur(path):
+    """Séparateur d'un CSV brut : ';' tel que publié, ',' pour les anciens exports"""
+    with open(path, encoding="utf-8") as f:
+        entete = f.readline()
+    return ";" if entete.count(";") > entete.count(",") else ","
+
+
+def nettoyer(df, referentiel=None):
+    """
+    Dédoublonnage, typage et tri par Mois d'un DataFrame brut (indicateurs déjà
+    convertis à la lecture), puis ajout du code ISO3 des pays si un référentiel est fourni
+    """
+    # Suppression des doublons
+    df = df.drop_duplicates()
+    print(f"  Shape après dédoublonnage: {df.shape}")
+    df = trier_par_mois(typer_colonnes(df))
+    return joindre_iso3(df, referentiel) if referentiel is not None else df
+
+
+def referentiel_pays(raw_dir=RAW_DIR):
+    """Référentiel des pays, complété par les codes ISO3 de frequentation_hoteliere"""
+    path = Path(raw_dir) / "frequentation_hoteliere.csv"
+    hotel = None
+    if path.exists():
+        hotel = pd.read_csv(path, sep=detecter_separateur(path), dtype=str,
+                            usecols=lambda col: col in {"Pays", "ISO3", "Region"})
+    return charger_referentiel(hotel)
+
+
+def afficher_stats(stats):
+    """Affiche les valeurs manquantes et les échecs de conversion par indicateur"""
+    for col, valeurs in stats.items():
+        if valeurs["manquants"] > 0:
+            print(f"    {col}: {valeurs['manquants']} valeurs manquantes "
+                  f"(dont {valeurs['echecs']} non numériques)")
+
+
+def sauvegarder(df, cleaned_file, cleaned_dir=CLEANED_DIR):
+    """Écrit le store Arrow typé et son export CSV"""
+    df = df.reset_index(drop=True)
+
+    # Store colonnaire écrit déjà normalisé (types, tri, compactage) : relu par
+    # load_cleaned_data sans repasser par normaliser_schema
+    arrow_path = store_path(cleaned_file, cleaned_dir)
+    feather.write_feather(table_normalisee(normaliser_schema(df)[0]), arrow_path,
+                          compression="uncompressed")
+    print(f"  ✓ Store typé: {arrow_path}")
+
+    # Export CSV
+    cleaned_path = Path(cleaned_dir) / cleaned_file
+    df.to_csv(
+        cleaned_path,
+        index=False,
+        sep=",",
+        float_format=FLOAT_FORMAT,
+        encoding="utf-8"
+    )
+    print(f"  ✓ Sauvegardé: {cleaned_path}\n")
+
+
+def nettoyer_partitions(df, entry, cleaned_file, cleaned_dir=CLEANED_DIR, referentiel=None):
+    """
+    Nettoyage incrémental d'un fichier partitionné par Mois : seules les partitions
+    nouvelles ou modifiées sont nettoyées puis fusionnées avec le store existant.
+    Renvoie None si le store précédent n'est pas réutilisable.
+    """
+    arrow_path = store_path(cleaned_file, cleaned_dir)
+    anciennes = entry.get("partitions") if entry else None
+    if not anciennes or not arrow_path.exists():
+        return None
+
+    nouvelles = hash_partitions(df)
+    modifiees = [m for m, h in nouvelles.items() if anciennes.get(m) != h]
+    supprimees = [m for m in anciennes if m not in nouvelles]
+    print(f"  Partitions: {len(modifiees)} à nettoyer, {len(supprimees)} supprimées, "
+          f"{len(nouvelles) - len(modifiees)} inchangées")
+
+    existant = feather.read_table(arrow_path, memory_map=True).to_pandas()
+    a_retirer = pd.to_datetime(modifiees + supprimees)
+    existant = existant[~existant["Mois"].isin(a_retirer)]
+
+    delta = nettoyer(df[df["Mois"].isin(modifiees)], referentiel)
+    fusion = pd.concat([delta, existant], ignore_index=True)
+    return trier_par_mois(typer_colonnes(fusion)), nouvelles
+
+
+# -----------------------------
+# Cube d'agrégats persisté
+# -----------------------------
+def cube_path(cleaned_dir=CLEANED_DIR):
+    return Path(cleaned_dir) / CUBE_STORE
+
+
+def entree_cube(manifest):
+    """Entrée "cube_region" attendue pour l'état courant du manifeste (None sans fichier source)"""
+    source = manifest["files"].get(CUBE_SOURCE)
+    if source is None:
+        return None
+    return {
+        "sha256": source["sha256"],
+        "pipeline_version": manifest.get("pipeline_version"),
+        "referentiel": manifest.get("referentiel"),
+        "partitions": source.get("partitions"),
+    }
+
+
+def cube_a_jour(manifest, cleaned_dir=CLEANED_DIR):
+    """Vrai si le cube persisté correspond aux données nettoyées décrites par le manifeste"""
+    attendu = entree_cube(manifest)
+    actuel = manifest.get("cube_region")
+    return (attendu is not None and actuel is not None and cube_path(cleaned_dir).exists()
+            and all(actuel.get(cle) == valeur for cle, valeur in attendu.items()))
+
+
+def lire_par_lots(path):
+    """
+    Lots (RecordBatch) d'un fichier Arrow IPC, lus un à un sans memory-map :
+    seul le lot courant est en mémoire, le fichier n'est pas projeté en entier
+    """
+    with pa.OSFile(str(path)) as f:
+        lecteur = pa.ipc.open_file(f)
+        for i in range(lecteur.num_record_batches):
+            yield lecteur.get_batch(i)
+
+
+def lignes_par_mois(source):
+    """
+    Nombre de lignes du store par mois. Seule la colonne Mois est lue (memory-map :
+    les autres colonnes ne sont pas chargées) ; les mois manquants sont ignorés.
+    """
+    mois = feather.read_table(source, columns=["Mois"], memory_map=True)["Mois"]
+    compte = {pd.Timestamp(v["values"]): v["counts"]
+              for v in pc.value_counts(mois).to_pylist() if v["values"] is not None}
+    return dict(sorted(compte.items()))
+
+
+def tranches_mois(compte, chunksize=CHUNKSIZE):
+    """
+    Mois regroupés en tranches consécutives d'au plus `chunksize` lignes (un
+    mois plus gros forme sa propre tranche) : le cube d'une tranche, qui a au
+    plus autant de cellules que de lignes, tient dans la même borne mémoire
+    qu'un bloc du mode streaming
+    """
+    tranches, tranche, lignes = [], [], 0
+    for mois, n in compte.items():
+        if tranche and lignes + n > chunksize:
+            tranches.append(tranche)
+            tranche, lignes = [], 0
+        tranche.append(mois)
+        lignes += n
+    if tranche:
+        tranches.append(tranche)
+    return tranches
+
+
+def repartir_cubes(source, tranches, refaire, dossier):
+    """
+    Cubes partiels des mois `refaire`, répartis par tranche en une seule passe
+    sur le store (qui n'a pas à être trié par Mois) : chaque lot est replié en
+    cube partiel, découpé par tranche et ajouté au fichier Arrow de sa tranche
+    dans `dossier`. Au plus CUBE_FICHIERS_OUVERTS fichiers ouverts : au-delà,
+    une passe par paquet de tranches. Renvoie {indice de tranche: chemin}.
+    """
+    fichiers = {}
+    for premier in range(0, len(tranches), CUBE_FICHIERS_OUVERTS):
+        paquet = range(premier, min(premier + CUBE_FICHIERS_OUVERTS, len(tranches)))
+        tranche_du_mois = {m: i for i in paquet for m in tranches[i] if m in refaire}
+        if not tranche_du_mois:
+            continue
+        writers, schema, valeurs = {}, None, None
+        try:
+            for lot in lire_par_lots(source):
+                if valeurs is None:
+                    valeurs = pa.array(list(tranche_du_mois), type=lot.schema.field("Mois").type)
+                lot = lot.filter(pc.is_in(lot.column("Mois"), value_set=valeurs))
+                if not lot.num_rows:
+                    continue
+                partiel = construire_cube(normaliser_schema(lot.to_pandas())[0])
+                if schema is None:
+                    schema = schema_flux(partiel)
+                for i, morceau in partiel.groupby(partiel["Mois"].map(tranche_du_mois), sort=False):
+                    if i not in writers:
+                        fichiers[i] = Path(dossier) / f"tranche_{i}.arrow"
+                        writers[i] = pa.ipc.new_file(str(fichiers[i]), schema)
+                    writers[i].write_table(pa.Table.from_pandas(morceau, preserve_index=False).cast(schema))
+        finally:
+            for writer in writers.values():
+                writer.close()
+    return fichiers
+
+
+def cube_de_tranche(path):
+    """Cube d'une tranche : ses cubes partiels (fichier de repartir_cubes) repliés"""
+    partiels = [lot.to_pandas() for lot in lire_par_lots(path)]
+    return replier_cube(partiels)
+
+
+class CurseurCube:
+    """Lecture séquentielle d'un cube persisté (trié par Mois), tranche de mois par tranche de mois"""
+
+    def __init__(self, path):
+        self._lots = lire_par_lots(path)
+        self._reste = None
+
+    def jusqu_a(self, fin):
+        """Cellules suivantes du cube jusqu'au mois `fin` inclus (None s'il n'y en a pas)"""
+        morceaux = []
+        while True:
+            if self._reste is None:
+                lot = next(self._lots, None)
+                if lot is None:
+                    break
+                self._reste = lot.to_pandas()
+            avant = self._reste["Mois"] <= fin
+            if avant.all():
+                morceaux.append(self._reste)
+                self._reste = None
+                continue
+            morceaux.append(self._reste[avant])
+            self._reste = self._reste[~avant]
+            break
+        return pd.concat(morceaux, ignore_index=True) if morceaux else None
+
+
+def maintenir_cube(manifest, cleaned_dir=CLEANED_DIR, chunksize=CHUNKSIZE):
+    """
+    Tient à jour le cube persisté après un nettoyage. Le store est lu une fois
+    (voir repartir_cubes), puis le cube est écrit tranche de mois par tranche
+    de mois, dans l'ordre des mois : chaque cellule étant propre à un mois,
+    seule la tranche courante est en mémoire, quelle que soit la taille du
+    fichier. Les mesures étant additives, seuls les mois nouveaux ou modifiés
+    (empreintes de partitions) sont recalculés à partir de leurs lignes ; les
+    cellules des autres mois sont recopiées depuis le cube existant.
+    Reconstruction complète si le cube est absent ou d'une autre version du
+    pipeline. Renvoie True si le cube a été réécrit.
+    """
+    attendu = entree_cube(manifest)
+    source = store_path(FILES[CUBE_SOURCE], cleaned_dir)
+    if attendu is None or not source.exists() or cube_a_jour(manifest, cleaned_dir):
+        return False
+
+    actuel = manifest.get("cube_region") or {}
+    anciennes, nouvelles = actuel.get("partitions"), attendu["partitions"]
+    incremental = (anciennes and nouvelles and cube_path(cleaned_dir).exists()
+                   and all(actuel.get(cle) == attendu[cle] for cle in ("pipeline_version", "referentiel")))
+    compte = lignes_par_mois(source)
+    if incremental:
+        a_refaire = {pd.Timestamp(m) for m, h in nouvelles.items() if anciennes.get(m) != h}
+        a_retirer = a_refaire | {pd.Timestamp(m) for m in anciennes if m not in nouvelles}
+        curseur = CurseurCube(cube_path(cleaned_dir))
+        print(f"Cube d'agrégats : {len(a_refaire)} mois recalculés, {len(a_retirer) - len(a_refaire)} supprimés, "
+              f"{len(nouvelles) - len(a_refaire)} repris tels quels")
+    else:
+        a_refaire, a_retirer, curseur = set(compte), set(), None
+        print("Cube d'agrégats : construction complète")
+
+    tmp = cube_path(cleaned_dir).with_suffix(".tmp")
+    tranches = tranches_mois(compte, chunksize)
+    writer, cellules = None, 0
+    try:
+        # Cubes partiels déversés par tranche à côté du store (même disque), supprimés à la fin
+        with tempfile.TemporaryDirectory(prefix=".cube-", suffix=".tmp", dir=cleaned_dir) as dossier:
+            partiels = repartir_cubes(source, tranches, a_refaire, dossier)
+            for i, tranche in enumerate(tranches):
+                morceaux = []
+                if curseur is not None:
+                    existant = curseur.jusqu_a(tranche[-1])
+                    if existant is not None:
+                        morceaux.append(existant[~existant["Mois"].isin(a_retirer)])
+                if i in partiels:
+                    morceaux.append(cube_de_tranche(partiels[i]))
+                morceaux = [m for m in morceaux if len(m)]
+                if not morceaux:
+                    continue
+                colonnes = morceaux[0].columns
+                cube = pd.concat([m[colonnes] for m in morceaux], ignore_index=True)
+                cube = cube.sort_values("Mois", kind="stable", ignore_index=True)
+                if writer is None:
+                    schema = schema_flux(cube)
+                    writer = pa.ipc.new_file(str(tmp), schema)
+                writer.write_table(pa.Table.from_pandas(cube, preserve_index=False).cast(schema))
+                cellules += len(cube)
+        if writer is None:
+            return False
+        writer.close()
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        tmp.unlink(missing_ok=True)
+        raise
+    tmp.replace(cube_path(cleaned_dir))
+    manifest["cube_region"] = {**attendu, "lignes": cellules}
+    print(f"  ✓ Cube: {cube_path(cleaned_dir)} ({cellules} cellules)\n")
+    return True
+
+
+# -----------------------------
+# Mode streaming (fichiers plus gros que la RAM)
+# -----------------------------
+class EmpreintesVues:
+    """
+    Ensemble des empreintes 64 bits des lignes déjà écrites, dans un tampon
+    trié préalloué. C'est la seule structure du mode streaming qui croît avec
+    le fichier : 8 octets par ligne unique (plus la marge du tampon, agrandi de
+    moitié quand il est plein), au lieu du DataFrame complet.
+    Les empreintes nouvelles d'un bloc y sont fusionnées en place, depuis la
+    fin, par fenêtres de FENETRE_FUSION : ni nouveau tri de l'ensemble, ni
+    copie temporaire de sa taille.
+    """
+
+    def __init__(self, capacite=1 << 16):
+        self._tampon = np.empty(capacite, dtype=np.uint64)
+        self._n = 0
+
+    @property
+    def vues(self):
+        return self._tampon[:self._n]
+
+    def filtrer(self, df):
+        """Garde les lignes jamais vues (dans ce bloc comme dans les précédents)"""
+        digests = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        nouveau = ~pd.Series(digests).duplicated().to_numpy()
+        if self._n:
+            vues = self.vues
+            pos = np.minimum(np.searchsorted(vues, digests), self._n - 1)
+            nouveau &= vues[pos] != digests
+        self._fusionner(np.sort(digests[nouveau]))
+        return df[nouveau]
+
+    def _fusionner(self, nouvelles):
+        k = len(nouvelles)
+        if k == 0:
+            return
+        if self._n + k > len(self._tampon):
+            tampon = np.empty(max(self._n + k, len(self._tampon) * 3 // 2), dtype=np.uint64)
+            tampon[:self._n] = self._tampon[:self._n]
+            self._tampon = tampon
+        tampon = self._tampon
+        # i anciennes et j nouvelles restent à placer, dans tampon[:fin].
+        # Les FENETRE_FUSION plus grandes sont parmi les dernières de chaque liste ;
+        # la zone écrite ne recouvre que des anciennes déjà lues.
+        i, j, fin = self._n, k, self._n + k
+        while j > 0:
+            anciennes = tampon[max(i - FENETRE_FUSION, 0):i]
+            fenetre = np.concatenate([anciennes, nouvelles[max(j - FENETRE_FUSION, 0):j]])
+            fenetre.sort()
+            haut = fenetre[-FENETRE_FUSION:]
+            nb_anciennes = len(anciennes) - int(np.searchsorted(anciennes, haut[0]))
+            tampon[fin - len(haut):fin] = haut
+            i -= nb_anciennes
+            j -= len(haut) - nb_anciennes
+            fin -= len(haut)
+        self._n += k
+
+
+def schema_flux(df):
+    """
+    Schéma Arrow fixe pour l'écriture par blocs : libellés en texte (les
+    dictionnaires diffèrent d'un bloc à l'autre, la conversion en category
+    est faite au chargement) et indicateurs en float64.
+    """
+    champs = []
+    for col in df.columns:
+        if col in NUMERIC_COLS:
+            champs.append(pa.field(col, pa.float64()))
+        elif isinstance(df[col].dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(df[col]):
+            champs.append(pa.field(col, pa.string()))
+        else:
+            champs.append(pa.field(col, pa.from_numpy_dtype(df[col].dtype)))
+    return pa.schema(champs)
+
+
+def nettoyer_flux(path, cleaned_file, cleaned_dir=CLEANED_DIR, chunksize=CHUNKSIZE,
+                  referentiel=None):
+    """
+    Nettoie un fichier brut par blocs de `chunksize` lignes : dédoublonnage global
+    par empreintes de lignes, store Arrow et export CSV écrits au fil de l'eau.
+    La mémoire utilisée dépend de la taille des blocs, plus 8 octets par ligne
+    unique (EmpreintesVues, seule structure proportionnelle au fichier).
+    Les lignes restent dans l'ordre du fichier brut : le tri par Mois est fait au
+    chargement (normaliser_schema).
+    Le store et l'export sont écrits dans des fichiers .tmp, renommés à la fin :
+    un nettoyage interrompu laisse en place les fichiers précédents.
+    Renvoie (lignes lues, lignes écrites, empreintes de partitions, statistiques de conversion).
+    """
+    arrow_path = store_path(cleaned_file, cleaned_dir)
+    cleaned_path = Path(cleaned_dir) / cleaned_file
+    arrow_tmp = arrow_path.with_name(arrow_path.name + ".tmp")
+    cleaned_tmp = cleaned_path.with_name(cleaned_path.name + ".tmp")
+    vues = EmpreintesVues()
+    partitions = {}
+    stats = {}
+    lus = ecrits = 0
+    writer = None
+
+    lecteur = lire_csv_blocs(path, sep=detecter_separateur(path), chunksize=chunksize)
+    try:
+        for i, (bloc, stats_bloc) in enumerate(lecteur):
+            lus += len(bloc)
+            cumuler_stats(stats, stats_bloc)
+            if "Mois" in bloc.columns:
+                for mois, h in sommes_partitions(bloc).items():
+                    partitions[mois] = (partitions.get(mois, 0) + h) % 2**64
+
+            bloc = typer_colonnes(vues.filtrer(bloc))
+            if referentiel is not None:
+                bloc = joindre_iso3(bloc, referentiel)
+            ecrits += len(bloc)
+
+            if writer is None:
+                schema = schema_flux(bloc)
+                writer = pa.ipc.new_file(str(arrow_tmp), schema)
+            writer.write_table(pa.Table.from_pandas(bloc, preserve_index=False).cast(schema))
+            bloc.to_csv(cleaned_tmp, mode="w" if i == 0 else "a", header=(i == 0),
+                        index=False, sep=",", float_format=FLOAT_FORMAT, encoding="utf-8")
+            print(f"  Bloc {i + 1}: {lus} lignes lues, {ecrits} écrites")
+    except BaseException:
+        if writer is not None:
+            writer.close()
+        arrow_tmp.unlink(missing_ok=True)
+        cleaned_tmp.unlink(missing_ok=True)
+        raise
+    if writer is not None:
+        writer.close()
+        arrow_tmp.replace(arrow_path)
+        cleaned_tmp.replace(cleaned_path)
+
+    afficher_stats(stats)
+    print(f"  ✓ Store typé: {arrow_path}")
+    print(f"  ✓ Sauvegardé: {cleaned_path}\n")
+    partitions = {mois: f"{h:016x}" for mois, h in partitions.items()} if partitions else None
+    return lus, ecrits, partitions, stats
+
+
+def clean_tourism_data(raw_dir=RAW_DIR, cleaned_dir=CLEANED_DIR, force=False, chunksize=None):
+    """
+    Nettoie les fichiers bruts modifiés depuis le dernier passage (voir manifest.json).
+    Renvoie le dictionnaire des DataFrames effectivement re-nettoyés.
+
+    chunksize : si renseigné, mode streaming (fichiers plus gros que la RAM) ;
+    rien n'est alors gardé en mémoire et le dictionnaire renvoyé est vide.
+    """
+    Path(cleaned_dir).mkdir(parents=True, exist_ok=True)
+    manifest = charger_manifest(cleaned_dir)
+    referentiel = referentiel_pays(raw_dir)
+    empreinte = empreinte_referentiel(referentiel)
+    meme_version = (manifest.get("pipeline_version") == PIPELINE_VERSION
+                    and manifest.get("referentiel") == empreinte and not force)
+    if not meme_version:
+        print(f"Pipeline v{PIPELINE_VERSION} : nettoyage complet\n")
+        manifest = {"pipeline_version": PIPELINE_VERSION, "referentiel": empreinte, "files": {}}
+
     cleaned_dfs = {}
+    modifie = False
     for raw_file, cleaned_file in FILES.items():
-        path = RAW_DIR / raw_file
+        path = Path(raw_dir) / raw_file
         print(f"Nettoyage de {raw_file}...")
-        
+
         if not path.exists():
             print(f"   {path} n'existe pas !")
             continue
-        
-        # Lecture avec le bon séparateur
-        df = pd.read_csv(path, sep=",", encoding='utf-8')
-        
+
+        sha, taille = hash_fichier(path)
+        entry = manifest["files"].get(raw_file)
+        if entry and entry["sha256"] == sha and store_path(cleaned_file, cleaned_dir).exists():
+            print("  Inchangé depuis le dernier nettoyage, ignoré\n")
+            continue
+
+        modifie = True
+        if chunksize:
+            lus, ecrits, partitions, stats = nettoyer_flux(path, cleaned_file, cleaned_dir,
+                                                           chunksize, referentiel)
+            manifest["files"][raw_file] = {
+                "sha256": sha,
+                "size": taille,
+                "rows": lus,
+                "cleaned": cleaned_file,
+                "cleaned_rows": ecrits,
+                "partitions": partitions,
+                "conversion": stats,
+            }
+            sauver_manifest(manifest, cleaned_dir)
+            continue
+
+        # Lecture avec le bon séparateur, indicateurs convertis au parsing (virgule décimale)
+        df, stats = lire_csv(path, sep=detecter_separateur(path))
+
         print(f"  Colonnes: {df.columns.tolist()}")
         print(f"  Shape avant: {df.shape}")
-        
-        # Suppression des doublons
-        df = df.drop_duplicates()
-        print(f"  Shape après dédoublonnage: {df.shape}")
-        
-        # Conversion des colonnes numériques
-        numeric_cols = ["Nombre de touristes", "Nombre de croisièristes", 
-                       "Nuitées touristiques", "Durée de séjor moyenne"]
-        
-        for col in numeric_cols:
-            if col in df.columns:
-                # Convertir en string, gérer les virgules décimales
-                df[col] = (df[col]
-                          .astype(str)
-                          .str.replace(',', '.')  # Virgule → point
-                          .str.strip()            # Enlever espaces
-                          .str.replace('"', ''))  # Enlever guillemets si présents
-                
-                # Convertir en numérique
-                df[col] = pd.to_numeric(df[col], errors="coerce")
-                
-                # Afficher le nombre de valeurs manquantes
-                n_missing = df[col].isna().sum()
-                if n_missing > 0:
-                    print(f"    {col}: {n_missing} valeurs manquantes")
-        
-        cleaned_dfs[raw_file] = df
-        
-        # Sauvegarde propre
-        cleaned_path = CLEANED_DIR / cleaned_file
-        df.to_csv(
-            cleaned_path, 
-            index=False, 
-            sep=",",
-            encoding="utf-8"
-        )
-        print(f"  ✓ Sauvegardé: {cleaned_path}\n")
-    
+        afficher_stats(stats)
+
+        partitions = None
+        resultat = (nettoyer_partitions(df, entry, cleaned_file, cleaned_dir, referentiel)
+                    if "Mois" in df.columns else None)
+        if resultat is not None:
+            df_clean, partitions = resultat
+        else:
+            df_clean = nettoyer(df, referentiel)
+            if "Mois" in df.columns:
+                partitions = hash_partitions(df)
+
+        cleaned_dfs[raw_file] = df_clean
+        sauvegarder(df_clean, cleaned_file, cleaned_dir)
+
+        manifest["files"][raw_file] = {
+            "sha256": sha,
+            "size": taille,
+            "rows": len(df),
+            "cleaned": cleaned_file,
+            "cleaned_rows": len(df_clean),
+            "partitions": partitions,
+            "conversion": stats,
+        }
+        sauver_manifest(manifest, cleaned_dir)
+
+    # Cube d'agrégats : seuls les mois nouveaux ou modifiés sont recalculés
+    if maintenir_cube(manifest, cleaned_dir, chunksize or CHUNKSIZE):
+        sauver_manifest(manifest, cleaned_dir)
+        modifie = True
+
+    # Nouvelle version des données : les résultats mis en cache sur disque sont périmés
+    cache = cache_disque() if modifie else None
+    if cache is not None:
+        n = cache.purger(version_donnees(cleaned_dir))
+        print(f"Cache disque : {n} résultats périmés supprimés")
+
     return cleaned_dfs
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Nettoyage des fichiers bruts")
+    parser.add_argument("--force", action="store_true", help="re-nettoyer tous les fichiers")
+    parser.add_argument("--streaming", action="store_true",
+                        help="traiter les fichiers par blocs (fichiers plus gros que la RAM)")
+    parser.add_argument("--chunksize", type=int, default=CHUNKSIZE)
+    args = parser.parse_args()
+
     print(f"RAW_DIR: {RAW_DIR}")
     print(f"CLEANED_DIR: {CLEANED_DIR}\n")
-    clean_tourism_data()
-    print(" Nettoyage terminé !")
\ No newline at end of file
+    clean_tourism_data(force=args.force, chunksize=args.chunksize if args.streaming else None)
+    print(" Nettoyage terminé !")
+
+    # Page d'accueil pré-calculée pour cette version des données (import local : les pages dépendent de ce module)
+    from src.pages.home import texte_accueil
+    from src.utils.registry import registre_dashboard
+    texte_accueil(registre_dashboard(CLEANED_DIR))
+    print(" Page d'accueil pré-calculée")
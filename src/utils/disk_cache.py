@@ -0,0 +1,152 @@
+# src/utils/disk_cache.py
+"""
+Cache de résultats sur disque, partagé par tous les processus d'une machine.
+
+Une base SQLite (data/cache/resultats.sqlite) associe à chaque empreinte de
+requête un résultat sérialisé (octets) et la version des données qui l'a
+produit. Plusieurs workers Streamlit et les redémarrages profitent ainsi des
+calculs déjà faits. Les entrées d'une autre version sont purgées après chaque
+nettoyage, et les moins récemment utilisées sont évincées au-delà de
+CACHE_MAX_OCTETS.
+
+Le cache ne doit jamais faire échouer l'application : toute erreur SQLite
+est traitée comme une absence de résultat.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.feather as feather
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "cache"
+CACHE_FILE = "resultats.sqlite"
+CACHE_MAX_OCTETS = 512 * 2**20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS resultats (
+    cle     TEXT PRIMARY KEY,
+    version TEXT NOT NULL,
+    valeur  BLOB NOT NULL,
+    taille  INTEGER NOT NULL,
+    acces   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resultats_acces ON resultats (acces);
+CREATE INDEX IF NOT EXISTS resultats_version ON resultats (version);
+"""
+
+
+def empreinte(*elements):
+    """Empreinte stable d'une requête (repr de ses paramètres)"""
+    return hashlib.sha256(repr(elements).encode("utf-8")).hexdigest()
+
+
+def df_vers_octets(df):
+    """DataFrame → Arrow IPC (types, catégories et dates conservés)"""
+    sink = pa.BufferOutputStream()
+    feather.write_feather(df.reset_index(drop=True), sink, compression="uncompressed")
+    return sink.getvalue().to_pybytes()
+
+
+def octets_vers_df(valeur):
+    return feather.read_table(pa.BufferReader(valeur)).to_pandas()
+
+
+class CacheDisque:
+    def __init__(self, path, max_octets=CACHE_MAX_OCTETS):
+        self.path = Path(path)
+        self.max_octets = max_octets
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connexion()) as con, con:
+            # WAL : lectures concurrentes pendant qu'un autre processus écrit
+            con.execute("PRAGMA journal_mode=WAL")
+            con.executescript(SCHEMA)
+
+    def _connexion(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, cle, version):
+        """Résultat mis en cache pour (cle, version), ou None"""
+        try:
+            with closing(self._connexion()) as con, con:
+                ligne = con.execute(
+                    "SELECT valeur FROM resultats WHERE cle = ? AND version = ?", (cle, version)
+                ).fetchone()
+                if ligne is not None:
+                    con.execute("UPDATE resultats SET acces = ? WHERE cle = ?", (time.time(), cle))
+        except sqlite3.Error as e:
+            print(f"Cache disque indisponible ({e})")
+            return None
+        return ligne[0] if ligne is not None else None
+
+    def set(self, cle, version, valeur):
+        """Enregistre un résultat (octets), puis évince au-delà de max_octets"""
+        if len(valeur) > self.max_octets:
+            return
+        try:
+            with closing(self._connexion()) as con, con:
+                con.execute(
+                    "INSERT OR REPLACE INTO resultats VALUES (?, ?, ?, ?, ?)",
+                    (cle, version, sqlite3.Binary(valeur), len(valeur), time.time()),
+                )
+                self._evincer(con)
+        except sqlite3.Error as e:
+            print(f"Cache disque indisponible ({e})")
+
+    def _evincer(self, con):
+        total = con.execute("SELECT COALESCE(SUM(taille), 0) FROM resultats").fetchone()[0]
+        if total <= self.max_octets:
+            return
+        # Entrées les moins récemment utilisées d'abord
+        a_liberer = total - self.max_octets
+        cles = []
+        for cle, taille in con.execute("SELECT cle, taille FROM resultats ORDER BY acces"):
+            cles.append((cle,))
+            a_liberer -= taille
+            if a_liberer <= 0:
+                break
+        con.executemany("DELETE FROM resultats WHERE cle = ?", cles)
+
+    def purger(self, version):
+        """
+        Supprime les résultats calculés sur une autre version des données,
+        ainsi que les fichiers "<nom>-<version>.parquet|.arrow" des autres versions
+        """
+        for motif in ("*.parquet", "*.arrow"):
+            for path in self.path.parent.glob(motif):
+                if not path.stem.endswith(f"-{version}"):
+                    path.unlink(missing_ok=True)
+        try:
+            with closing(self._connexion()) as con, con:
+                n = con.execute("DELETE FROM resultats WHERE version != ?", (version,)).rowcount
+        except sqlite3.Error as e:
+            print(f"Cache disque indisponible ({e})")
+            return 0
+        return n
+
+    def stats(self):
+        with closing(self._connexion()) as con:
+            n, octets = con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(taille), 0) FROM resultats"
+            ).fetchone()
+        return {"entrees": n, "octets": octets}
+
+
+_caches = {}
+_verrou = threading.Lock()
+
+
+def cache_disque(cache_dir=None):
+    """Cache disque du répertoire donné, CACHE_DIR par défaut (None s'il ne peut pas être ouvert)"""
+    path = Path(cache_dir or CACHE_DIR) / CACHE_FILE
+    with _verrou:
+        if path not in _caches:
+            try:
+                _caches[path] = CacheDisque(path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"Cache disque désactivé ({e})")
+                _caches[path] = None
+        return _caches[path]
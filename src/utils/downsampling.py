@@ -0,0 +1,81 @@
+# src/utils/downsampling.py
+"""
+Réduction du nombre de points des séries temporelles avant tracé.
+
+Largest-Triangle-Three-Buckets (LTTB) : la série est découpée en `seuil - 2`
+paquets ; dans chaque paquet on garde le point qui forme le plus grand triangle
+avec le point retenu précédemment et la moyenne du paquet suivant. Les pics et
+creux restent visibles avec quelques centaines de points.
+
+C'est un garde-fou à seuil, pas un niveau de détail adaptatif : une série qui
+tient dans le budget est renvoyée intacte, et les séries mensuelles du jeu
+publié (quelques centaines de mois) n'y touchent jamais. Seules des données
+synthétiques ou bien plus volumineuses sont réduites. Le zoom Plotly agit sur
+les points déjà envoyés au navigateur, sans nouvelle requête : il ne rend pas
+les points écartés. Seul un filtre de période plus étroit, qui relance le
+calcul, peut faire repasser une série sous le seuil.
+"""
+import numpy as np
+import pandas as pd
+
+# Budget de points par trace (au-delà seulement, la série est réduite)
+POINTS_PAR_SERIE = 1000
+
+
+def _en_nombres(valeurs):
+    valeurs = pd.Series(valeurs)
+    if pd.api.types.is_datetime64_any_dtype(valeurs):
+        valeurs = valeurs.astype("int64")
+    return np.nan_to_num(valeurs.to_numpy(dtype="float64"))
+
+
+def lttb_indices(x, y, seuil):
+    """Positions des points retenus par LTTB (toutes si len(x) <= seuil)"""
+    n = len(x)
+    if seuil >= n or seuil < 3:
+        return np.arange(n)
+
+    x = _en_nombres(x)
+    y = _en_nombres(y)
+    # Premier et dernier points toujours conservés, seuil - 2 paquets entre les deux
+    bornes = np.linspace(1, n - 1, seuil - 1).astype(np.int64)
+    indices = np.empty(seuil, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(seuil - 2):
+        debut, fin = bornes[i], bornes[i + 1]
+        # Moyenne du paquet suivant (dernier point pour le dernier paquet)
+        suivant = slice(fin, bornes[i + 2]) if i + 2 < len(bornes) else slice(n - 1, n)
+        x_moy, y_moy = x[suivant].mean(), y[suivant].mean()
+
+        aires = np.abs(
+            (x[a] - x_moy) * (y[debut:fin] - y[a])
+            - (x[a] - x[debut:fin]) * (y_moy - y[a])
+        )
+        a = debut + int(np.argmax(aires))
+        indices[i + 1] = a
+
+    return indices
+
+
+def sous_echantillonner(df, x, y, par=None, seuil=POINTS_PAR_SERIE):
+    """
+    Lignes de `df` à tracer : au plus `seuil` points par série et par colonne `y`.
+
+    `y` : colonne ou liste de colonnes tracées sur le même axe x ; on garde
+    l'union des points retenus pour chacune, pour que les traces restent alignées.
+    `par` : colonne(s) identifiant les séries (une trace par valeur).
+    L'ordre des lignes de `df` est conservé.
+    """
+    colonnes = [y] if isinstance(y, str) else list(y)
+    groupes = [df] if par is None else [g for _, g in df.groupby(par, observed=True, sort=False)]
+    if all(len(g) <= seuil for g in groupes):
+        return df
+
+    garder = []
+    for g in groupes:
+        g = g.sort_values(x)
+        positions = np.unique(np.concatenate([lttb_indices(g[x], g[col], seuil) for col in colonnes]))
+        garder.append(g.index[positions])
+    return df[df.index.isin(np.concatenate(garder))]
@@ -0,0 +1,81 @@
+# src/utils/export.py
+"""
+Export des résultats filtrés (CSV, CSV gzip, Parquet), écrit par blocs.
+
+Le fichier n'est produit qu'à la demande : les pages passent à
+st.download_button une fonction (voir components/telechargement), appelée
+seulement au clic. L'export est écrit bloc par bloc dans un tampon BytesIO
+(que Streamlit lit sans recopie) : ni chaîne CSV complète, ni seconde copie
+en octets, ni copie du DataFrame source (chaque bloc est une tranche iloc).
+La source peut aussi être un itérable de DataFrames (blocs lus au fil de
+l'eau par le moteur de requêtes, voir query_engine.lots_lignes).
+Le pic mémoire est celui du fichier exporté plus un bloc.
+"""
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# format : (extension, type MIME)
+FORMATS_EXPORT = {
+    "CSV": (".csv", "text/csv"),
+    "CSV gzip": (".csv.gz", "application/gzip"),
+    "Parquet": (".parquet", "application/octet-stream"),
+}
+LIGNES_PAR_BLOC = 50_000
+
+
+def blocs(df, lignes_par_bloc=LIGNES_PAR_BLOC):
+    """Tranches successives de df (vues, sans copie)"""
+    for debut in range(0, len(df), lignes_par_bloc):
+        yield df.iloc[debut:debut + lignes_par_bloc]
+
+
+def lots(source, lignes_par_bloc=LIGNES_PAR_BLOC):
+    """Blocs de la source : tranches d'un DataFrame (au moins une, pour l'en-tête), ou itérable de DataFrames"""
+    if not hasattr(source, "iloc"):
+        yield from source
+    elif len(source) == 0:
+        yield source
+    else:
+        yield from blocs(source, lignes_par_bloc)
+
+
+def blocs_csv(source, lignes_par_bloc=LIGNES_PAR_BLOC):
+    """CSV encodé en UTF-8, bloc par bloc (en-tête dans le premier)"""
+    for i, bloc in enumerate(lots(source, lignes_par_bloc)):
+        yield bloc.to_csv(index=False, header=(i == 0)).encode("utf-8")
+
+
+def ecrire_export(source, format_, sortie, lignes_par_bloc=LIGNES_PAR_BLOC):
+    """Écrit l'export de la source (DataFrame ou blocs) au format demandé dans le fichier binaire `sortie`"""
+    if format_ not in FORMATS_EXPORT:
+        raise ValueError(f"Format d'export inconnu : {format_} (attendu : {', '.join(FORMATS_EXPORT)})")
+    if format_ == "CSV":
+        for bloc in blocs_csv(source, lignes_par_bloc):
+            sortie.write(bloc)
+    elif format_ == "CSV gzip":
+        with gzip.GzipFile(fileobj=sortie, mode="wb") as gz:
+            for bloc in blocs_csv(source, lignes_par_bloc):
+                gz.write(bloc)
+    else:
+        # Un row group par bloc, schéma du premier bloc
+        writer = None
+        try:
+            for bloc in lots(source, lignes_par_bloc):
+                if writer is None:
+                    schema = pa.Schema.from_pandas(bloc, preserve_index=False)
+                    writer = pq.ParquetWriter(sortie, schema)
+                writer.write_table(pa.Table.from_pandas(bloc, schema=schema, preserve_index=False))
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+def fichier_export(source, format_):
+    """Tampon rembobiné contenant l'export de la source (DataFrame ou blocs)"""
+    fichier = io.BytesIO()
+    ecrire_export(source, format_, fichier)
+    fichier.seek(0)
+    return fichier
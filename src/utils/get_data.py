@@ -1,6 +1,12 @@
 # src/utils/get_data.py
-import pandas as pd
+import http.client
+import json
 import os
+import shutil
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
 # URLs des datasets
 URLS = {
@@ -12,16 +18,196 @@ URLS = {
 # Répertoire existant où stocker les fichiers
 RAW_DIR = "data/raw/"
 
-def load_raw_data():
-    dfs = {}
-    for name, url in URLS.items():
+# Validateurs HTTP (ETag / Last-Modified) des derniers téléchargements
+HTTP_CACHE_FILE = ".http_cache.json"
+
+MAX_WORKERS = 4
+MAX_RETRIES = 4
+BACKOFF = 1.0        # secondes, doublé à chaque nouvelle tentative
+TIMEOUT = 60
+CHUNK_SIZE = 1 << 16
+
+# Erreurs HTTP qui justifient une nouvelle tentative
+RETRY_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def charger_validateurs(raw_dir=RAW_DIR):
+    path = os.path.join(raw_dir, HTTP_CACHE_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sauver_validateurs(validateurs, raw_dir=RAW_DIR):
+    path = os.path.join(raw_dir, HTTP_CACHE_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(validateurs, f, indent=2)
+    os.replace(tmp, path)
+
+
+class TelechargementIncomplet(Exception):
+    """Corps de réponse plus court que la taille annoncée (le .part est conservé pour reprise)"""
+
+
+def taille_attendue(resp, deja):
+    """
+    Taille complète attendue du fichier : total de Content-Range (206) ou
+    Content-Length (200). None si le serveur ne l'annonce pas ; ValueError si
+    la plage reçue ne prolonge pas les `deja` octets du .part.
+    """
+    if resp.status == 206:
+        plage = resp.headers.get("Content-Range", "")
+        # "bytes debut-fin/total"
+        try:
+            debut, total = plage.split(" ", 1)[1].split("-", 1)[0], plage.rsplit("/", 1)[1]
+        except IndexError:
+            raise ValueError(f"Content-Range invalide : {plage!r}")
+        if int(debut) != deja:
+            raise ValueError(f"plage reçue à partir de {debut}, attendue à partir de {deja}")
+        if total != "*":
+            return int(total)
+        longueur = resp.headers.get("Content-Length")
+        return deja + int(longueur) if longueur is not None else None
+    longueur = resp.headers.get("Content-Length")
+    return int(longueur) if longueur is not None else None
+
+
+def charger_partiel(part):
+    """Validateurs de la réponse dont le .part contient le début (reprise entre deux lancements)"""
+    path = part + ".json"
+    if not os.path.exists(part) or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def sauver_partiel(part, partiel):
+    with open(part + ".json", "w", encoding="utf-8") as f:
+        json.dump(partiel, f)
+
+
+def supprimer_partiel(part, fichier=True):
+    for path in ([part] if fichier else []) + [part + ".json"]:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def telecharger(name, url, raw_dir=RAW_DIR, validateur=None,
+                retries=MAX_RETRIES, backoff=BACKOFF, timeout=TIMEOUT):
+    """
+    Télécharge un dataset en streaming vers raw_dir/<name>.csv.
+
+    - requête conditionnelle (If-None-Match / If-Modified-Since) : 304 → fichier inchangé
+    - reprise d'un fichier .part interrompu via Range / If-Range, y compris d'un
+      lancement à l'autre (validateurs du .part dans <name>.csv.part.json)
+    - taille vérifiée (Content-Length, ou total de Content-Range) : une réponse
+      tronquée est une erreur temporaire, le .part est gardé pour la reprise
+    - nouvelles tentatives avec backoff exponentiel
+    - renommage atomique du .part une fois le téléchargement complet et vérifié
+    """
+    dest = os.path.join(raw_dir, f"{name}.csv")
+    part = dest + ".part"
+    validateur = validateur or {}
+    partiel = charger_partiel(part)
+
+    for tentative in range(retries + 1):
+        headers = {}
+        if os.path.exists(dest):
+            if validateur.get("etag"):
+                headers["If-None-Match"] = validateur["etag"]
+            if validateur.get("last_modified"):
+                headers["If-Modified-Since"] = validateur["last_modified"]
+
+        deja = os.path.getsize(part) if os.path.exists(part) else 0
+        if deja and (partiel.get("etag") or partiel.get("last_modified")):
+            headers["Range"] = f"bytes={deja}-"
+            headers["If-Range"] = partiel.get("etag") or partiel["last_modified"]
+
+        try:
+            req = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(req, timeout=timeout) as resp:
+                if resp.status != 206:
+                    deja = 0
+                attendu = taille_attendue(resp, deja)
+                partiel = {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                }
+                sauver_partiel(part, partiel)
+                with open(part, "ab" if deja else "wb") as f:
+                    shutil.copyfileobj(resp, f, CHUNK_SIZE)
+            recu = os.path.getsize(part)
+            if attendu is not None and recu != attendu:
+                if recu > attendu:
+                    # Plus d'octets qu'annoncé : le .part n'est pas fiable
+                    supprimer_partiel(part)
+                    partiel = {}
+                raise TelechargementIncomplet(f"{recu} octets reçus sur {attendu} annoncés")
+            os.replace(part, dest)
+            supprimer_partiel(part, fichier=False)
+            return {"statut": "telecharge", "taille": recu, **partiel}
+
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return {"statut": "inchange", **validateur}
+            if e.code == 416 and os.path.exists(part):
+                # Plage invalide : on repart de zéro
+                supprimer_partiel(part)
+                partiel = {}
+            elif e.code not in RETRY_STATUS:
+                raise
+            erreur = e
+        except TelechargementIncomplet as e:
+            erreur = e
+        except ValueError as e:
+            # Plage incohérente avec le .part : on repart de zéro
+            supprimer_partiel(part)
+            partiel = {}
+            erreur = e
+        except (urllib.error.URLError, http.client.IncompleteRead, TimeoutError, ConnectionError) as e:
+            erreur = e
+
+        if tentative < retries:
+            attente = backoff * 2 ** tentative
+            print(f"  {name}: {erreur} - nouvelle tentative dans {attente:.1f}s")
+            time.sleep(attente)
+
+    raise erreur
+
+
+def load_raw_data(urls=URLS, raw_dir=RAW_DIR, max_workers=MAX_WORKERS, **options):
+    """
+    Télécharge les datasets en parallèle dans raw_dir.
+    Les fichiers sont écrits tels que publiés (sans passage par pandas) :
+    le séparateur est détecté au nettoyage.
+    """
+    os.makedirs(raw_dir, exist_ok=True)
+    validateurs = charger_validateurs(raw_dir)
+
+    def tache(item):
+        name, url = item
         print(f"Téléchargement de {name}...")
-        df = pd.read_csv(url, sep=";")
-        dfs[name] = df
-        # Sauvegarde directe dans data/raw/
-        df.to_csv(os.path.join(RAW_DIR, f"{name}.csv"), index=False)
-        print(f"{name} sauvegardé dans {RAW_DIR}{name}.csv")
-    return dfs
+        return name, telecharger(name, url, raw_dir, validateurs.get(name), **options)
+
+    resultats = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for name, resultat in pool.map(tache, urls.items()):
+                resultats[name] = resultat
+                if resultat["statut"] == "inchange":
+                    print(f"{name} inchangé depuis le dernier téléchargement")
+                else:
+                    print(f"{name} sauvegardé dans {os.path.join(raw_dir, name)}.csv")
+                    validateurs[name] = {
+                        "etag": resultat.get("etag"),
+                        "last_modified": resultat.get("last_modified"),
+                    }
+    finally:
+        # Conserver les validateurs des fichiers déjà téléchargés même en cas d'échec
+        sauver_validateurs(validateurs, raw_dir)
+    return resultats
 
 if __name__ == "__main__":
     load_raw_data()
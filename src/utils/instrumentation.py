@@ -0,0 +1,188 @@
+# src/utils/instrumentation.py
+"""
+Mesure des temps de rendu par page et par section.
+
+Désactivée par défaut (config.INSTRUMENTATION) : `mesurer` renvoie alors un
+contexte vide partagé et `compter` ne fait rien, le coût se limite au test
+d'un booléen. Activée, chaque section mesurée produit une ligne JSON :
+
+    {"ts": 1760650000.0, "page": "home", "section": "chiffres clés",
+     "secondes": 0.012, "lignes": 1993, "octets": 0}
+
+- secondes : temps écoulé (horloge murale) dans la section ;
+- lignes : lignes du cube lues par le moteur de requêtes pandas ;
+- octets : taille des figures envoyées au navigateur (JSON Plotly).
+
+Les lignes vont dans un journal JSONL à rotation (data/metrics/latences.jsonl)
+et sont cumulées par (page, section) pour un export au format texte
+Prometheus, servi en local sur /metrics si un port est configuré.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+METRICS_DIR = Path(__file__).parent.parent.parent / "data" / "metrics"
+JOURNAL_FILE = "latences.jsonl"
+JOURNAL_MAX_OCTETS = 5 * 2**20
+JOURNAL_ARCHIVES = 3
+
+_actif = False
+_journal = logging.getLogger("tourism.instrumentation")
+_journal.propagate = False
+_courante = ContextVar("mesure_courante", default=None)
+_cumuls = {}
+_verrou = threading.Lock()
+_serveur = None
+_NEUTRE = nullcontext()
+
+
+class Mesure:
+    """Compteurs d'une section en cours (lignes lues, octets envoyés)"""
+
+    __slots__ = ("page", "section", "lignes", "octets")
+
+    def __init__(self, page, section):
+        self.page = page
+        self.section = section
+        self.lignes = 0
+        self.octets = 0
+
+
+def activer(metrics_dir=None, port=None):
+    """Active l'instrumentation (sans effet si déjà active) ; exporteur Prometheus si `port`"""
+    global _actif, _serveur
+    with _verrou:
+        if not _journal.handlers:
+            path = Path(metrics_dir or METRICS_DIR)
+            path.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(path / JOURNAL_FILE, maxBytes=JOURNAL_MAX_OCTETS,
+                                          backupCount=JOURNAL_ARCHIVES, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _journal.addHandler(handler)
+            _journal.setLevel(logging.INFO)
+        if port is not None and _serveur is None:
+            try:
+                _serveur = ThreadingHTTPServer(("127.0.0.1", port), ExporteurPrometheus)
+            except OSError as e:
+                # Port déjà pris (autre worker) : le journal reste écrit
+                print(f"Exporteur Prometheus non démarré ({e})")
+            else:
+                threading.Thread(target=_serveur.serve_forever, daemon=True).start()
+        _actif = True
+
+
+def desactiver():
+    """Désactive l'instrumentation, ferme le journal et arrête l'exporteur"""
+    global _actif, _serveur
+    with _verrou:
+        _actif = False
+        for handler in list(_journal.handlers):
+            _journal.removeHandler(handler)
+            handler.close()
+        if _serveur is not None:
+            _serveur.shutdown()
+            _serveur.server_close()
+            _serveur = None
+        _cumuls.clear()
+
+
+def mesurer(page, section):
+    """Contexte mesurant une section de page (contexte vide si l'instrumentation est inactive)"""
+    if not _actif:
+        return _NEUTRE
+    return _mesure(page, section)
+
+
+@contextmanager
+def _mesure(page, section):
+    mesure = Mesure(page, section)
+    jeton = _courante.set(mesure)
+    debut = time.perf_counter()
+    try:
+        yield mesure
+    finally:
+        secondes = time.perf_counter() - debut
+        _courante.reset(jeton)
+        # Une section imbriquée compte aussi pour la section englobante
+        parent = _courante.get()
+        if parent is not None:
+            parent.lignes += mesure.lignes
+            parent.octets += mesure.octets
+        enregistrer(mesure, secondes)
+
+
+def compter(lignes=0, octets=0):
+    """Ajoute des lignes lues / octets envoyés à la section en cours"""
+    if not _actif:
+        return
+    mesure = _courante.get()
+    if mesure is not None:
+        mesure.lignes += lignes
+        mesure.octets += octets
+
+
+def enregistrer(mesure, secondes):
+    _journal.info(json.dumps({
+        "ts": round(time.time(), 3),
+        "page": mesure.page,
+        "section": mesure.section,
+        "secondes": round(secondes, 6),
+        "lignes": mesure.lignes,
+        "octets": mesure.octets,
+    }, ensure_ascii=False))
+    with _verrou:
+        cumul = _cumuls.setdefault((mesure.page, mesure.section), [0, 0.0, 0, 0])
+        cumul[0] += 1
+        cumul[1] += secondes
+        cumul[2] += mesure.lignes
+        cumul[3] += mesure.octets
+
+
+def _etiquette(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def texte_prometheus():
+    """Cumuls par (page, section) au format d'exposition texte de Prometheus"""
+    with _verrou:
+        cumuls = sorted((cle, list(valeurs)) for cle, valeurs in _cumuls.items())
+    metriques = [
+        ("dashboard_section_secondes", "summary", "Temps de rendu des sections (secondes)"),
+        ("dashboard_section_lignes_total", "counter", "Lignes lues par le moteur de requêtes"),
+        ("dashboard_section_octets_total", "counter", "Octets de figures envoyés au navigateur"),
+    ]
+    lignes = []
+    for i, (nom, type_, aide) in enumerate(metriques):
+        lignes += [f"# HELP {nom} {aide}", f"# TYPE {nom} {type_}"]
+        for (page, section), (n, secondes, nb_lignes, octets) in cumuls:
+            etiquettes = f'page="{_etiquette(page)}",section="{_etiquette(section)}"'
+            if i == 0:
+                lignes.append(f"{nom}_sum{{{etiquettes}}} {secondes:.6f}")
+                lignes.append(f"{nom}_count{{{etiquettes}}} {n}")
+            else:
+                lignes.append(f"{nom}{{{etiquettes}}} {(nb_lignes, octets)[i - 1]}")
+    return "\n".join(lignes) + "\n"
+
+
+class ExporteurPrometheus(BaseHTTPRequestHandler):
+    """Exporteur local : GET /metrics renvoie texte_prometheus()"""
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        corps = texte_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+    def log_message(self, *args):
+        pass
@@ -1,45 +1,67 @@
 # src/utils/load_data.py
-import pandas as pd
+import pyarrow.feather as feather
 import os
 
+from src.utils.clean_data import store_path
+from src.utils.schema import depuis_table, empreinte_memoire, lire_csv, normaliser_schema
+
 CLEANED_DIR = "data/cleaned/"
 
-def load_cleaned_data():
-    files = {
-        "frequentation_hoteliere": "frequentation_hoteliere_cleaned.csv",
-        "frequentation_mensuelle": "frequentation_mensuelle_cleaned.csv",
-        "frequentation_region": "frequentation_region_cleaned.csv",
-    }
-
-    dfs = {}
-    for key, filename in files.items():
-        path = os.path.join(CLEANED_DIR, filename)
-        
-        print(f"Chargement de {filename}...")
-        
-        # Lecture simple avec virgule
-        df = pd.read_csv(path, sep=",", encoding="utf-8")
-        
+FILES = {
+    "frequentation_hoteliere": "frequentation_hoteliere_cleaned.csv",
+    "frequentation_mensuelle": "frequentation_mensuelle_cleaned.csv",
+    "frequentation_region": "frequentation_region_cleaned.csv",
+}
+
+
+def afficher_memoire(memoire):
+    """Empreinte mémoire avant/après compactage (une copie par processus, partagée par les sessions)"""
+    gain = 1 - memoire["apres"] / memoire["avant"] if memoire["avant"] else 0
+    print(f"  Mémoire: {memoire['avant'] / 1024:.1f} Ko → {memoire['apres'] / 1024:.1f} Ko "
+          f"(-{gain:.0%})")
+
+
+def load_dataset(key, cleaned_dir=CLEANED_DIR):
+    """Charge un seul dataset nettoyé (store Arrow, ou export CSV à défaut)"""
+    filename = FILES[key]
+    path = os.path.join(cleaned_dir, filename)
+    arrow_path = store_path(filename, cleaned_dir)
+
+    if arrow_path.exists():
+        # Store typé produit par clean_data, lu sans parsing. Écrit déjà normalisé,
+        # il est converti sans renormaliser (une seule copie, celle de la lecture) ;
+        # un store du mode streaming (texte, non trié) est encore normalisé ici.
+        print(f"Chargement de {arrow_path.name}...")
+        df, memoire = depuis_table(feather.read_table(arrow_path))
+
         print(f"  Colonnes: {df.columns.tolist()}")
         print(f"  Shape: {df.shape}")
-        
-        # Conversion des colonnes numériques si nécessaire
-        num_cols = ["Nombre de touristes", "Nombre de croisièristes", 
-                   "Nuitées touristiques", "Durée de séjour moyenne"]
-        for col in num_cols:
-            if col in df.columns:
-                # Si déjà numérique, on skip
-                if df[col].dtype in ['int64', 'float64']:
-                    continue
-                df[col] = pd.to_numeric(
-                    df[col].astype(str).str.replace(",", "."), 
-                    errors="coerce"
-                )
-
-        dfs[key] = df
+        if memoire is not None:
+            afficher_memoire(memoire)
+        else:
+            print(f"  Mémoire: {empreinte_memoire(df) / 1024:.1f} Ko (store déjà normalisé)")
         print(f"  ✓ Chargé avec succès\n")
+        return df
+
+    # Repli sur l'export CSV si le store n'a pas encore été généré
+    print(f"Chargement de {filename}...")
+
+    # Indicateurs convertis au parsing (l'export utilise le point décimal)
+    df, _ = lire_csv(path, sep=",", decimal=".")
+
+    print(f"  Colonnes: {df.columns.tolist()}")
+    print(f"  Shape: {df.shape}")
+
+    # Conversion des dates et libellés
+    df, memoire = normaliser_schema(df)
+    afficher_memoire(memoire)
+    print(f"  ✓ Chargé avec succès\n")
+    return df
+
 
-    return dfs
+def load_cleaned_data(cleaned_dir=CLEANED_DIR):
+    """Charge les trois datasets nettoyés d'un coup"""
+    return {key: load_dataset(key, cleaned_dir) for key in FILES}
 
 
 if __name__ == "__main__":
@@ -48,4 +70,4 @@ if __name__ == "__main__":
         print(f"\n=== {k} ===")
         print(f"Shape: {df.shape}")
         print(f"Colonnes: {df.columns.tolist()}")
-        print(df.head())
\ No newline at end of file
+        print(df.head())
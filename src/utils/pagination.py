@@ -0,0 +1,63 @@
+# src/utils/pagination.py
+"""
+Tri et découpage côté serveur des tableaux paginés.
+
+L'ordre des lignes d'un tableau pour une colonne de tri (argsort stable,
+valeurs manquantes en dernier) est calculé une fois puis mémorisé sous une
+clé fournie par la page (version des données, filtres, colonne). Changer de
+page ou de sens de tri ne fait ensuite que découper ce tableau de positions :
+seules les lignes de la page affichée sont extraites du DataFrame.
+"""
+import numpy as np
+
+from src.utils.cache import CacheLRU
+
+ORDRES_MAX_ENTREES = 64
+ORDRES_MAX_OCTETS = 32 * 2**20
+
+# (clé, colonne, nombre de lignes) → (positions triées, nombre de valeurs non manquantes)
+cache_ordres = CacheLRU(ORDRES_MAX_ENTREES, ORDRES_MAX_OCTETS, taille=lambda v: v[0].nbytes)
+
+
+def _argsort(serie):
+    """Positions des lignes triées par ordre croissant (stable, manquantes en dernier)"""
+    serie = serie.reset_index(drop=True)
+    ordre = serie.sort_values(kind="stable", na_position="last").index.to_numpy(dtype=np.intp)
+    return ordre, int(serie.notna().sum())
+
+
+def _ordre(df, col, cle):
+    if cle is None:
+        return _argsort(df[col])
+    cle = (cle, col, len(df))
+    entree = cache_ordres.get(cle)
+    if entree is None:
+        entree = _argsort(df[col])
+        cache_ordres.set(cle, entree)
+    return entree
+
+
+def positions_page(df, col, croissant, debut, fin, cle=None):
+    """
+    Positions (iloc) des lignes [debut, fin[ de df trié par `col`. En ordre
+    décroissant, les valeurs sont lues à rebours, les manquantes restent en dernier.
+    """
+    ordre, nb_valides = _ordre(df, col, cle)
+    debut, fin = max(debut, 0), min(fin, len(ordre))
+    if croissant:
+        return ordre[debut:fin]
+    # Rang k < nb_valides en décroissant : ordre[nb_valides - 1 - k]
+    fin_valides = min(fin, nb_valides)
+    a_rebours = ordre[nb_valides - fin_valides:nb_valides - debut][::-1] if debut < fin_valides else ordre[:0]
+    manquantes = ordre[max(debut, nb_valides):fin]
+    return np.concatenate([a_rebours, manquantes]) if len(manquantes) else a_rebours
+
+
+def ordre_complet(df, col, croissant, cle=None):
+    """Positions de toutes les lignes de df triées par `col` (export)"""
+    return positions_page(df, col, croissant, 0, len(df), cle)
+
+
+def page_triee(df, col, croissant, debut, fin, cle=None):
+    """Lignes [debut, fin[ de df trié par `col`"""
+    return df.iloc[positions_page(df, col, croissant, debut, fin, cle)]
@@ -0,0 +1,353 @@
+# src/utils/query_engine.py
+"""
+Moteurs de requêtes des pages.
+
+Les pages n'accèdent plus directement au cube : elles demandent une agrégation
+(`agreger`), des totaux (`totaux`), la liste des valeurs d'une dimension
+(`valeurs`) ou les lignes détaillées de frequentation_region pour un jeu de
+filtres (mêmes clés que filtrer_cube : regions, pays, debut, fin, annee).
+Les lignes détaillées ne sont jamais extraites en entier pour une session :
+une page triée (`page_lignes`) pour le tableau, des blocs triés
+(`lots_lignes`) pour l'export, les noms de colonnes (`colonnes_lignes`) sans
+lire de ligne.
+
+Chaque moteur porte un index des classements (rankings.IndexClassements) :
+les Top N des pages en lisent un préfixe. Les coordonnées des régions
+(`coords_regions`) sont calculées une fois par version des données.
+
+- MoteurPandas : filtres et groupby pandas sur le cube en mémoire (défaut).
+- MoteurDuckDB : requêtes SQL poussées à DuckDB sur une copie Parquet de
+  frequentation_region triée par Mois. Les statistiques min/max des row groups
+  évitent de lire les mois hors période : la latence suit la taille de la
+  sélection, et la mémoire reste celle du moteur (pas de DataFrame complet).
+  DuckDB est optionnel (pip install duckdb) ; sans lui, repli sur pandas.
+"""
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from src.utils.aggregates import (ATTRIBUTS, DUREE, NUITEES, TOURISTES, agreger, filtrer_cube,
+                                  totaux)
+from src.utils import disk_cache
+from src.utils.disk_cache import empreinte
+from src.utils.clean_data import store_path
+from src.utils.export import LIGNES_PAR_BLOC
+from src.utils.instrumentation import compter
+from src.utils.load_cleaned_data import FILES
+from src.utils.pagination import ordre_complet, page_triee
+from src.utils.rankings import IndexClassements, precalculer_classements
+from src.utils.reference import centroide, charger_referentiel, coordonnees
+from src.utils.time_index import IndexMois
+
+MOTEURS = ("pandas", "duckdb")
+
+# Taille des row groups Parquet (granularité du saut de lecture par période)
+ROW_GROUP = 65_536
+DUCKDB_MEMOIRE = "1GB"
+
+
+class MoteurPandas:
+    """
+    Requêtes pandas sur le cube d'agrégats en mémoire. Le cube est trié par Mois :
+    la période est une tranche trouvée par IndexMois, seuls les filtres sur
+    les régions et pays parcourent les lignes (de cette tranche).
+    `registre` (optionnel) donne accès à frequentation_region et à son index
+    des mois pour `lignes`, et aux coordonnées des régions ; ils ne sont
+    chargés qu'au premier appel.
+    """
+
+    def __init__(self, cube, registre=None):
+        self.cube = cube
+        self._registre = registre
+        self._coords_regions = None
+        self.colonnes = list(cube.columns)
+        self.index_mois = IndexMois.depuis_colonne(cube["Mois"]) if "Mois" in cube.columns else None
+        self.classements = IndexClassements(self)
+
+    def tranche(self, filtres=None):
+        filtres = dict(filtres or {})
+        periode = {cle: filtres.pop(cle, None) for cle in ("debut", "fin", "annee")}
+        cube = self.cube
+        if self.index_mois is not None:
+            cube = self.index_mois.tranche(cube, **periode)
+        else:
+            filtres.update(periode)
+        if filtres:
+            cube = filtrer_cube(cube, **filtres)
+        compter(lignes=len(cube))
+        return cube
+
+    def agreger(self, by, filtres=None, attributs=()):
+        return agreger(self.tranche(filtres), by, attributs)
+
+    def totaux(self, filtres=None):
+        return totaux(self.tranche(filtres))
+
+    def valeurs(self, col, filtres=None):
+        """Valeurs distinctes triées d'une dimension"""
+        return sorted(self.tranche(filtres)[col].unique().tolist())
+
+    def coords_regions(self):
+        """Coordonnées des régions : entrée du registre, calculée une fois par version des données"""
+        if self._registre is not None:
+            return self._registre["coords_regions"]
+        if self._coords_regions is None:
+            self._coords_regions = localiser_regions(self)
+        return self._coords_regions
+
+    def lignes(self, filtres=None):
+        """Lignes de frequentation_region sélectionnées (la période est une tranche, sans copie)"""
+        if self._registre is None:
+            raise ValueError("Moteur construit sans registre : pas d'accès aux lignes détaillées")
+        filtres = dict(filtres or {})
+        periode = {cle: filtres.pop(cle, None) for cle in ("debut", "fin", "annee")}
+        df = self._registre["index_mois"].tranche(self._registre["frequentation_region"], **periode)
+        if filtres:
+            df = filtrer_cube(df, **filtres)
+        compter(lignes=len(df))
+        return df
+
+    def colonnes_lignes(self):
+        """Colonnes de frequentation_region"""
+        if self._registre is None:
+            raise ValueError("Moteur construit sans registre : pas d'accès aux lignes détaillées")
+        return list(self._registre["frequentation_region"].columns)
+
+    def _cle_lignes(self, filtres):
+        """Clé de mémorisation des ordres de tri d'une sélection (voir pagination)"""
+        version = getattr(self._registre, "version", None)
+        return empreinte(version, "frequentation_region", sorted((filtres or {}).items())) if version else None
+
+    def page_lignes(self, filtres, tri, croissant, debut, fin):
+        """Lignes [debut, fin[ de la sélection triée par `tri` (ordre mémorisé : ni tri ni copie par page)"""
+        return page_triee(self.lignes(filtres), tri, croissant, debut, fin, cle=self._cle_lignes(filtres))
+
+    def lots_lignes(self, filtres, tri, croissant, lignes_par_bloc=LIGNES_PAR_BLOC):
+        """Sélection triée par `tri`, bloc par bloc (export) : un seul bloc copié à la fois"""
+        df = self.lignes(filtres)
+        ordre = ordre_complet(df, tri, croissant, self._cle_lignes(filtres))
+        for debut in range(0, max(len(ordre), 1), lignes_par_bloc):
+            yield df.iloc[ordre[debut:debut + lignes_par_bloc]]
+
+
+def parquet_region(registre, cleaned_dir, cache_dir=None):
+    """
+    Copie Parquet de frequentation_region triée par Mois, écrite une fois par
+    version des données dans le répertoire du cache disque (écriture atomique :
+    plusieurs processus peuvent la demander)
+    """
+    path = Path(cache_dir or disk_cache.CACHE_DIR) / f"frequentation_region-{registre.version}.parquet"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        store = store_path(FILES["frequentation_region"], cleaned_dir)
+        if store.exists():
+            table = feather.read_table(store, memory_map=True)
+        else:
+            table = pa.Table.from_pandas(registre["frequentation_region"], preserve_index=False)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(table.sort_by("Mois"), tmp, row_group_size=ROW_GROUP)
+        tmp.replace(path)
+    return path
+
+
+class MoteurDuckDB:
+    """
+    Requêtes SQL DuckDB sur le Parquet de frequentation_region. `registre`
+    (optionnel) donne accès aux coordonnées des régions.
+    """
+
+    def __init__(self, parquet, registre=None):
+        import duckdb
+
+        self._registre = registre
+        self._coords_regions = None
+
+        self._con = duckdb.connect()
+        self._con.execute(f"SET memory_limit = '{DUCKDB_MEMOIRE}'")
+        # file_row_number : position dans le Parquet, pour départager les égalités des tris
+        self._con.execute(f"CREATE VIEW region AS SELECT * FROM read_parquet("
+                          f"'{Path(parquet).as_posix()}', file_row_number = true)")
+        self.colonnes = [ligne[0] for ligne in self._con.execute("DESCRIBE region").fetchall()
+                         if ligne[0] != "file_row_number"]
+        self.index_mois = None
+        self.classements = IndexClassements(self)
+        if "Mois" in self.colonnes:
+            # Le Parquet est trié par Mois : effectifs cumulés = position de la première ligne de chaque mois
+            mois = self._requete('SELECT "Mois", COUNT(*) AS n FROM region GROUP BY 1 ORDER BY 1', [])
+            mois = mois[mois["Mois"].notna()]
+            debuts = [0, *mois["n"].cumsum().tolist()]
+            self.index_mois = IndexMois(pd.to_datetime(mois["Mois"]), debuts)
+
+    def _where(self, filtres):
+        """Clause WHERE et paramètres correspondant aux filtres de filtrer_cube"""
+        conditions, params = [], []
+        for col, cle in (("Region", "regions"), ("Pays", "pays")):
+            if filtres.get(cle) is not None:
+                valeurs = list(filtres[cle])
+                if not valeurs:
+                    conditions.append("FALSE")
+                    continue
+                conditions.append(f'"{col}" IN ({", ".join("?" * len(valeurs))})')
+                params.extend(valeurs)
+        if filtres.get("debut") is not None:
+            conditions.append('"Mois" >= ?')
+            params.append(pd.Timestamp(filtres["debut"]).to_pydatetime())
+        if filtres.get("fin") is not None:
+            conditions.append('"Mois" <= ?')
+            params.append(pd.Timestamp(filtres["fin"]).to_pydatetime())
+        if filtres.get("annee") is not None:
+            # Bornes explicites plutôt que year(Mois) : les row groups hors année sont sautés
+            annee = int(filtres["annee"])
+            conditions.append('"Mois" >= ? AND "Mois" < ?')
+            params.extend([pd.Timestamp(annee, 1, 1).to_pydatetime(),
+                           pd.Timestamp(annee + 1, 1, 1).to_pydatetime()])
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def _requete(self, sql, params):
+        # Un curseur par requête : la connexion est partagée entre les sessions (threads)
+        return self._con.cursor().execute(sql, params).df()
+
+    def agreger(self, by, filtres=None, attributs=()):
+        by = [by] if isinstance(by, str) else list(by)
+        where, params = self._where(filtres or {})
+        cles = ", ".join(f'"{col}"' for col in by)
+        attrs = "".join(f', any_value("{col}") AS "{col}"' for col in attributs)
+        df = self._requete(f'''
+            SELECT {cles},
+                   SUM("{TOURISTES}") AS "{TOURISTES}",
+                   SUM("{NUITEES}") AS "{NUITEES}",
+                   SUM("{DUREE}") / COUNT("{DUREE}") AS "{DUREE}"{attrs},
+                   COUNT(*) AS nb_lignes
+            FROM region {where}
+            GROUP BY {cles}
+            ORDER BY {cles}
+        ''', params)
+        compter(lignes=int(df["nb_lignes"].sum()))
+        return self._typer(df)[by + [TOURISTES, NUITEES, DUREE] + list(attributs)]
+
+    def totaux(self, filtres=None):
+        where, params = self._where(filtres or {})
+        ligne = self._requete(f'''
+            SELECT SUM("{TOURISTES}") AS t, SUM("{NUITEES}") AS n,
+                   SUM("{DUREE}") / COUNT("{DUREE}") AS d,
+                   COUNT(DISTINCT "Pays") AS nb_pays, COUNT(DISTINCT "Region") AS nb_regions,
+                   COUNT(*) AS nb_lignes
+            FROM region {where}
+        ''', params).iloc[0]
+        compter(lignes=int(ligne["nb_lignes"]))
+        return {
+            TOURISTES: ligne["t"] if pd.notna(ligne["t"]) else 0.0,
+            NUITEES: ligne["n"] if pd.notna(ligne["n"]) else 0.0,
+            DUREE: ligne["d"] if pd.notna(ligne["d"]) else float("nan"),
+            "nb_pays": int(ligne["nb_pays"]),
+            "nb_regions": int(ligne["nb_regions"]),
+            "nb_lignes": int(ligne["nb_lignes"]),
+        }
+
+    def valeurs(self, col, filtres=None):
+        where, params = self._where(filtres or {})
+        df = self._requete(f'SELECT "{col}", COUNT(*) AS n FROM region {where} GROUP BY 1 ORDER BY 1', params)
+        compter(lignes=int(df["n"].sum()))
+        return self._typer(df)[col].tolist()
+
+    def coords_regions(self):
+        """Coordonnées des régions : entrée du registre, calculée une fois par version des données"""
+        if self._registre is not None:
+            return self._registre["coords_regions"]
+        if self._coords_regions is None:
+            self._coords_regions = localiser_regions(self)
+        return self._coords_regions
+
+    def lignes(self, filtres=None):
+        """
+        Lignes de frequentation_region sélectionnées, dans l'ordre du Parquet
+        (trié par Mois) : les row groups hors période ne sont pas lus
+        """
+        where, params = self._where(filtres or {})
+        df = self._typer(self._requete(f"SELECT * EXCLUDE (file_row_number) FROM region {where}", params))
+        compter(lignes=len(df))
+        return df
+
+    def colonnes_lignes(self):
+        """Colonnes de frequentation_region (schéma du Parquet)"""
+        return list(self.colonnes)
+
+    def _select_trie(self, filtres, tri, croissant):
+        """
+        SELECT de la sélection triée par `tri`, dans le même ordre que
+        pagination.positions_page : à égalité, l'ordre du fichier (à rebours en
+        décroissant), valeurs manquantes en dernier dans l'ordre du fichier
+        """
+        where, params = self._where(filtres or {})
+        sens, rang = ("ASC", "file_row_number") if croissant else ("DESC", "-file_row_number")
+        sql = (f'SELECT * EXCLUDE (file_row_number) FROM region {where} '
+               f'ORDER BY "{tri}" {sens} NULLS LAST, '
+               f'CASE WHEN "{tri}" IS NULL THEN file_row_number ELSE {rang} END')
+        return sql, params
+
+    def page_lignes(self, filtres, tri, croissant, debut, fin):
+        """Lignes [debut, fin[ de la sélection triée (ORDER BY + LIMIT/OFFSET : seule la page est extraite)"""
+        sql, params = self._select_trie(filtres, tri, croissant)
+        df = self._typer(self._requete(f"{sql} LIMIT ? OFFSET ?", [*params, max(fin - debut, 0), debut]))
+        compter(lignes=len(df))
+        return df
+
+    def lots_lignes(self, filtres, tri, croissant, lignes_par_bloc=LIGNES_PAR_BLOC):
+        """Sélection triée, lue bloc par bloc dans le résultat DuckDB (export)"""
+        sql, params = self._select_trie(filtres, tri, croissant)
+        curseur = self._con.cursor()
+        lecteur = curseur.execute(sql, params).fetch_record_batch(lignes_par_bloc)
+        vide = True
+        for lot in lecteur:
+            vide = False
+            compter(lignes=lot.num_rows)
+            yield lot.to_pandas()
+        if vide:
+            # Un bloc vide pour l'en-tête (CSV) et le schéma (Parquet)
+            yield lecteur.schema.empty_table().to_pandas()
+
+    @staticmethod
+    def _typer(df):
+        """Mêmes types que les résultats pandas : Mois en datetime, libellés en category"""
+        if "Mois" in df.columns:
+            df["Mois"] = pd.to_datetime(df["Mois"])
+        for col in ["Region", "Pays", *ATTRIBUTS]:
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+        return df
+
+
+def localiser_regions(moteur):
+    """
+    Coordonnées (lat, lon) de chaque région des données, tirées du référentiel
+    des pays : centre des centroïdes de ses pays ou sous-régions (colonne Pays).
+    Les régions sans aucun pays localisé (Autres Pays...) sont absentes.
+    Une agrégation Region × Pays et une lecture du référentiel.
+    """
+    lieux = coordonnees(charger_referentiel())
+    paires = moteur.agreger(["Region", "Pays"])[["Region", "Pays"]]
+    for col in ("lat", "lon"):
+        paires[col] = paires["Pays"].astype(str).map(lieux[col])
+    paires = paires.dropna(subset=["lat", "lon"])
+    return paires.groupby("Region", observed=True)[["lat", "lon"]].apply(centroide)
+
+
+def creer_moteur(nom, registre, cleaned_dir, cache_dir=None):
+    """
+    Moteur `nom` pour le registre donné (repli sur pandas si DuckDB est absent),
+    avec les classements des pages pré-calculés
+    """
+    if nom not in MOTEURS:
+        raise ValueError(f"Moteur de requêtes inconnu : {nom} (attendu : {', '.join(MOTEURS)})")
+    if nom == "duckdb":
+        try:
+            return precalculer_classements(MoteurDuckDB(parquet_region(registre, cleaned_dir, cache_dir), registre))
+        except ImportError:
+            print("DuckDB non installé : repli sur le moteur pandas")
+    return precalculer_classements(MoteurPandas(registre["cube_region"], registre))
@@ -0,0 +1,122 @@
+# src/utils/rankings.py
+"""
+Index des classements : agrégats par pays (ou par région) pré-triés par
+métrique, pour une tranche de filtres donnée.
+
+Les Top N des pages (pays émetteurs, régions, classement économique,
+insights) lisent un préfixe du classement mémorisé : changer la valeur d'un
+slider top_n ne refait ni l'agrégation ni le tri. Le tri est stable et
+exclut les valeurs manquantes, comme nlargest / nsmallest (keep="first").
+
+L'index est rempli à la création du moteur de requêtes pour les tranches
+discrètes des pages (région × année, voir precalculer_classements), puis à
+la demande pour les autres (périodes libres de la page Régions), dans un
+cache LRU borné.
+"""
+import numpy as np
+
+from src.utils.aggregates import DUREE, NUITEES, TOURISTES
+from src.utils.cache import CacheLRU
+from src.utils.disk_cache import empreinte
+
+INTENSITE = "Intensité économique"
+
+# Métriques calculées à partir des colonnes agrégées
+METRIQUES_DERIVEES = {
+    INTENSITE: lambda df: df[NUITEES] / df[TOURISTES],
+}
+
+CLASSEMENTS_MAX_ENTREES = 2048
+CLASSEMENTS_MAX_OCTETS = 64 * 2**20
+
+# Classements pré-calculés : (dimension, attributs, [(métrique, croissant)])
+CLASSEMENTS_DASHBOARD = [
+    ("Pays", (), [(TOURISTES, False), (NUITEES, False), (INTENSITE, False),
+                  (DUREE, False), (DUREE, True)]),
+    ("Pays", ("Region",), [(TOURISTES, False), (NUITEES, False), (DUREE, False)]),
+]
+
+
+class Classement:
+    """Agrégats d'une tranche et ordres de tri (positions iloc) par (métrique, croissant)"""
+
+    __slots__ = ("df", "ordres")
+
+    def __init__(self, df):
+        self.df = df
+        self.ordres = {}
+
+    def ordre(self, metric, croissant=False):
+        cle = (metric, bool(croissant))
+        if cle not in self.ordres:
+            valeurs = self.df[metric].to_numpy(dtype="float64")
+            positions = np.flatnonzero(~np.isnan(valeurs))
+            # argsort stable : à égalité, l'ordre d'origine (comme keep="first")
+            tri = np.argsort(valeurs[positions] if croissant else -valeurs[positions], kind="stable")
+            self.ordres[cle] = positions[tri]
+        return self.ordres[cle]
+
+    def taille(self):
+        return self.df.shape[0] * (self.df.shape[1] + len(self.ordres)) * 8
+
+
+class IndexClassements:
+    """Classements mémorisés d'un moteur de requêtes (voir query_engine)"""
+
+    def __init__(self, moteur, max_entrees=CLASSEMENTS_MAX_ENTREES,
+                 max_octets=CLASSEMENTS_MAX_OCTETS):
+        self.moteur = moteur
+        self.cache = CacheLRU(max_entrees, max_octets, taille=Classement.taille)
+
+    @staticmethod
+    def _cle(by, filtres, attributs):
+        # Filtres triés par clé : la clé ne dépend pas de l'ordre de construction du dict
+        return empreinte(by, sorted((filtres or {}).items()), tuple(attributs))
+
+    def _tranche(self, by, filtres, attributs):
+        cle = self._cle(by, filtres, attributs)
+        entree = self.cache.get(cle)
+        if entree is None:
+            entree = self.ranger(by, filtres, attributs,
+                                 self.moteur.agreger(by, filtres, attributs=list(attributs)))
+        return entree
+
+    def ranger(self, by, filtres, attributs, df, tris=()):
+        """Enregistre `df`, agrégat par `by` de la tranche `filtres`, et ses ordres pour `tris`"""
+        for metric, calcul in METRIQUES_DERIVEES.items():
+            df[metric] = calcul(df)
+        entree = Classement(df)
+        for metric, croissant in tris:
+            entree.ordre(metric, croissant)
+        self.cache.set(self._cle(by, filtres, attributs), entree)
+        return entree
+
+    def top(self, by, metric, n=None, filtres=None, croissant=False, attributs=()):
+        """
+        Les n premiers agrégats par `by` selon `metric` (décroissant par défaut,
+        valeurs manquantes exclues ; n=None : tout le classement)
+        """
+        entree = self._tranche(by, filtres, attributs)
+        return entree.df.iloc[entree.ordre(metric, croissant)[:n]]
+
+
+def precalculer_classements(moteur):
+    """
+    Classements des pages pour toutes les tranches région (ou toutes) × année
+    (ou toutes), à la création du moteur. Par année, une agrégation par `by`
+    sur toutes les régions et une par (Region, by) découpée en tranches par
+    région : deux requêtes par année au lieu d'une par région.
+    """
+    index = moteur.classements
+    annees = moteur.index_mois.annees if moteur.index_mois is not None else []
+    for annee in [None, *annees]:
+        base = {} if annee is None else {"annee": annee}
+        for by, attributs, tris in CLASSEMENTS_DASHBOARD:
+            colonnes = [by, TOURISTES, NUITEES, DUREE, *attributs]
+            index.ranger(by, base, attributs, moteur.agreger(by, base, attributs=list(attributs)), tris)
+            par_region = moteur.agreger(["Region", by], base,
+                                        attributs=[a for a in attributs if a != "Region"])
+            for region, df in par_region.groupby("Region", observed=True, sort=False):
+                index.ranger(by, {"regions": [region], **base}, attributs,
+                             df[colonnes].reset_index(drop=True), tris)
+    return moteur
@@ -0,0 +1,245 @@
+# src/utils/rapports.py
+"""
+Rendu hors Streamlit des graphiques des pages, pour des briefings statiques.
+
+Un scénario fixe les filtres qu'un utilisateur choisirait dans les pages :
+
+    {"nom": "europe-2024", "regions": ["Europe"],
+     "debut": "2024-01", "fin": "2024-12", "metric": "Nuitées touristiques"}
+
+(toutes les clés sont optionnelles). Pour chaque scénario, les builders des
+pages Régions, International et Économie sont appelés avec ces filtres ;
+chaque figure est écrite en HTML autonome (ou en PNG via kaleido), avec un
+index.html qui reprend les indicateurs clés et les figures.
+
+Les scénarios sont répartis sur un pool de processus. Le cube est écrit une
+fois en Arrow IPC non compressé, puis chaque worker le lit en memory-map :
+les colonnes numériques pointent directement sur les pages du fichier,
+partagées par tous les processus via le cache du système.
+"""
+import html
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from src.pages import economic, international, regional
+from src.utils import disk_cache
+from src.utils.aggregates import DUREE, NUITEES, TOURISTES
+from src.utils.query_engine import MoteurPandas
+
+FORMATS = ("html", "png")
+METRIQUES = (TOURISTES, NUITEES, DUREE)
+
+# Nombre de pays / régions retenus par défaut dans les comparaisons
+NB_COMPARES = 5
+
+
+def _pays_compares(moteur, filtres, scenario):
+    return scenario.get("pays") or moteur.valeurs("Pays", filtres)[:NB_COMPARES]
+
+
+def _regions_comparees(moteur, filtres, scenario):
+    return scenario.get("regions") or moteur.valeurs("Region", filtres)[:3]
+
+
+# (page, nom de fichier, builder, options en fonction de (moteur, filtres, scénario))
+FIGURES = [
+    ("regional", "carte-monde", regional.fig_carte_monde,
+     lambda m, f, s: {"indicateur": s["metric"]}),
+    ("regional", "scatter-regions", regional.fig_scatter_regions,
+     lambda m, f, s: {"indicateur": s["metric"]}),
+    ("regional", "top-regions", regional.fig_top_regions,
+     lambda m, f, s: {"metric": s["metric"] if s["metric"] != DUREE else TOURISTES}),
+    ("regional", "duree-regions", regional.fig_duree_regions, lambda m, f, s: {}),
+    ("regional", "evolution-regions", regional.fig_evolution_regions,
+     lambda m, f, s: {"regions": _regions_comparees(m, f, s)}),
+    ("international", "carte-pays", international.fig_carte_pays,
+     lambda m, f, s: {"metric": s["metric"]}),
+    ("international", "top-pays", international.fig_top_pays,
+     lambda m, f, s: {"metric": s["metric"], "top_n": 15, "tri_ordre": "Décroissant"}),
+    ("international", "radar-pays", international.fig_radar_pays,
+     lambda m, f, s: {"pays": _pays_compares(m, f, s)}),
+    ("international", "evolution-pays", international.fig_evolution_pays,
+     lambda m, f, s: {"pays": _pays_compares(m, f, s)}),
+    ("economic", "intensite-regions", economic.fig_intensite_regions, lambda m, f, s: {}),
+    ("economic", "volume-duree", economic.fig_volume_duree, lambda m, f, s: {}),
+    ("economic", "evolution-intensite", economic.fig_evolution_intensite, lambda m, f, s: {}),
+    ("economic", "classement-pays", economic.fig_classement_pays,
+     lambda m, f, s: {"col_sort": NUITEES, "critere": "Nuitées totales", "top_n": 10}),
+    ("economic", "comparaison-pays", economic.fig_comparaison_pays,
+     lambda m, f, s: {"pays": _pays_compares(m, f, s)}),
+]
+
+
+def lire_scenarios(path):
+    """Liste de scénarios (fichier JSON : liste d'objets), avec valeurs par défaut et noms uniques"""
+    with open(path, encoding="utf-8") as f:
+        scenarios = json.load(f)
+    if not isinstance(scenarios, list):
+        raise ValueError(f"{path} : une liste de scénarios est attendue")
+    scenarios = [normaliser_scenario(s, i) for i, s in enumerate(scenarios)]
+    vus = set()
+    for scenario in scenarios:
+        nom, n = scenario["nom"], 1
+        while scenario["nom"] in vus:
+            n += 1
+            scenario["nom"] = f"{nom}-{n}"
+        vus.add(scenario["nom"])
+    return scenarios
+
+
+def normaliser_scenario(scenario, i=0):
+    scenario = dict(scenario)
+    scenario.setdefault("nom", f"scenario-{i + 1:03d}")
+    scenario.setdefault("metric", TOURISTES)
+    if scenario["metric"] not in METRIQUES:
+        raise ValueError(f"Métrique inconnue : {scenario['metric']} (attendu : {', '.join(METRIQUES)})")
+    if isinstance(scenario.get("regions"), str):
+        scenario["regions"] = [scenario["regions"]]
+    # Nom utilisé comme répertoire de sortie
+    scenario["nom"] = re.sub(r"[^\w.-]+", "-", str(scenario["nom"])).strip("-") or f"scenario-{i + 1:03d}"
+    return scenario
+
+
+def scenarios_par_region(regions, debut=None, fin=None, metric=TOURISTES):
+    """Un scénario par région, sur la même période"""
+    return [normaliser_scenario({"nom": region, "regions": [region], "debut": debut,
+                                 "fin": fin, "metric": metric}, i)
+            for i, region in enumerate(regions)]
+
+
+def filtres_scenario(scenario):
+    """Filtres du moteur de requêtes (fin de période : mois inclus)"""
+    filtres = {}
+    if scenario.get("regions"):
+        filtres["regions"] = list(scenario["regions"])
+    if scenario.get("pays"):
+        filtres["pays"] = list(scenario["pays"])
+    if scenario.get("debut"):
+        filtres["debut"] = pd.Timestamp(scenario["debut"])
+    if scenario.get("fin"):
+        filtres["fin"] = pd.Timestamp(scenario["fin"])
+    return filtres
+
+
+def ecrire_cube(registre, cache_dir=None):
+    """Cube de la version courante en Arrow IPC non compressé (lisible en memory-map), écrit une fois"""
+    path = Path(cache_dir or disk_cache.CACHE_DIR) / f"cube_region-{registre.version}.arrow"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        feather.write_feather(registre["cube_region"].reset_index(drop=True), tmp,
+                              compression="uncompressed")
+        tmp.replace(path)
+    return path
+
+
+# Moteur du processus worker (initialisé une fois par _initialiser_worker)
+_moteur = None
+
+
+def _initialiser_worker(cube_path):
+    global _moteur
+    table = feather.read_table(cube_path, memory_map=True)
+    # split_blocks : colonnes numériques sans copie, sur les pages du fichier
+    _moteur = MoteurPandas(table.to_pandas(split_blocks=True))
+
+
+def rendre_scenario(scenario, sortie, format_="html", moteur=None):
+    """Écrit les figures et l'index d'un scénario. Renvoie (nom, nombre de figures, secondes)"""
+    debut = time.perf_counter()
+    moteur = moteur or _moteur
+    dossier = Path(sortie) / scenario["nom"]
+    dossier.mkdir(parents=True, exist_ok=True)
+    filtres = filtres_scenario(scenario)
+
+    fichiers = []
+    for page, nom, builder, options in FIGURES:
+        fig = builder(moteur, filtres, **options(moteur, filtres, scenario))
+        if fig is None:
+            continue
+        fichier = f"{page}-{nom}.{format_}"
+        if format_ == "png":
+            fig.write_image(dossier / fichier)
+        else:
+            fig.write_html(dossier / fichier, include_plotlyjs="cdn")
+        fichiers.append(fichier)
+
+    ecrire_index(dossier, scenario, moteur.totaux(filtres), fichiers, format_)
+    return scenario["nom"], len(fichiers), time.perf_counter() - debut
+
+
+def ecrire_index(dossier, scenario, kpis, fichiers, format_):
+    periode = f"{scenario.get('debut') or 'début'} → {scenario.get('fin') or 'fin'}"
+    regions = ", ".join(scenario.get("regions") or ["toutes régions"])
+    lignes = [
+        ("Touristes (milliers)", f"{kpis[TOURISTES]:,.0f}"),
+        ("Nuitées (milliers)", f"{kpis[NUITEES]:,.0f}"),
+        ("Durée de séjour moyenne", f"{kpis[DUREE]:.1f} jours"),
+        ("Pays d'origine", kpis["nb_pays"]),
+        ("Régions", kpis["nb_regions"]),
+    ]
+    if format_ == "png":
+        figures = [f'<img src="{f}" alt="{f}">' for f in fichiers]
+    else:
+        figures = [f'<iframe src="{f}" title="{f}"></iframe>' for f in fichiers]
+    contenu = f"""<!DOCTYPE html>
+<html lang="fr">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(scenario['nom'])}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2em; }}
+table {{ border-collapse: collapse; }}
+td {{ padding: 0.2em 1em; border-bottom: 1px solid #ddd; }}
+iframe, img {{ width: 100%; height: 520px; border: none; object-fit: contain; }}
+</style>
+</head>
+<body>
+<h1>Briefing {html.escape(scenario['nom'])}</h1>
+<p>{html.escape(regions)} — {html.escape(periode)} — {html.escape(scenario['metric'])}</p>
+<table>
+{"".join(f"<tr><td>{html.escape(k)}</td><td>{html.escape(str(v))}</td></tr>" for k, v in lignes)}
+</table>
+{"".join(figures)}
+</body>
+</html>
+"""
+    (Path(dossier) / "index.html").write_text(contenu, encoding="utf-8")
+
+
+def rendre_scenarios(registre, scenarios, sortie, format_="html", workers=None):
+    """
+    Rend tous les scénarios sur un pool de `workers` processus (1 : dans le
+    processus courant). Renvoie la liste des (nom, nombre de figures, secondes).
+    """
+    if format_ not in FORMATS:
+        raise ValueError(f"Format inconnu : {format_} (attendu : {', '.join(FORMATS)})")
+    cube_path = ecrire_cube(registre)
+    workers = workers or os.cpu_count() or 1
+
+    resultats = []
+    if workers == 1 or len(scenarios) <= 1:
+        _initialiser_worker(cube_path)
+        for scenario in scenarios:
+            resultats.append(afficher_resultat(rendre_scenario(scenario, sortie, format_)))
+        return resultats
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(scenarios)),
+                             initializer=_initialiser_worker, initargs=(cube_path,)) as pool:
+        taches = [pool.submit(rendre_scenario, s, sortie, format_) for s in scenarios]
+        for tache in as_completed(taches):
+            resultats.append(afficher_resultat(tache.result()))
+    return resultats
+
+
+def afficher_resultat(resultat):
+    nom, nb_figures, secondes = resultat
+    print(f"  ✓ {nom} : {nb_figures} figures ({secondes:.1f} s)")
+    return resultat
@@ -0,0 +1,73 @@
+# src/utils/reference.py
+"""
+Référentiel des pays : variantes de noms → code ISO3, région, centroïde.
+
+Construit à partir de la table fournie (data/reference/pays.csv) complétée par
+les couples (Pays, ISO3) de frequentation_hoteliere. Le code ISO3 est ajouté
+une fois pour toutes au nettoyage (colonne category), les pages n'ont plus de
+correspondance à appliquer.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REFERENCE_FILE = Path(__file__).parent.parent.parent / "data" / "reference" / "pays.csv"
+
+COLONNES = ["Pays", "ISO3", "Region", "lat", "lon"]
+
+
+def charger_referentiel(hotel=None, path=REFERENCE_FILE):
+    """
+    Table des pays (une ligne par variante de nom).
+    `hotel` : DataFrame avec les colonnes Pays, ISO3 (et Region) ; ses pays
+    absents de la table fournie y sont ajoutés, sans centroïde.
+    """
+    ref = pd.read_csv(path, dtype={"Pays": str, "ISO3": str, "Region": str})
+    if hotel is not None and {"Pays", "ISO3"} <= set(hotel.columns):
+        connus = hotel.loc[hotel["ISO3"].notna() & (hotel["ISO3"] != ""),
+                           [c for c in COLONNES if c in hotel.columns]]
+        connus = connus.drop_duplicates("Pays")
+        ref = pd.concat([ref, connus[~connus["Pays"].isin(ref["Pays"])]], ignore_index=True)
+    return ref[COLONNES].sort_values("Pays", ignore_index=True)
+
+
+def centroide(points):
+    """
+    Centre (lat, lon) d'un ensemble de points : moyenne des vecteurs unitaires,
+    correcte de part et d'autre de l'antiméridien (Pacifique)
+    """
+    lat, lon = np.radians(points["lat"].to_numpy(float)), np.radians(points["lon"].to_numpy(float))
+    x, y, z = (np.cos(lat) * np.cos(lon)).mean(), (np.cos(lat) * np.sin(lon)).mean(), np.sin(lat).mean()
+    return pd.Series({"lat": np.degrees(np.arctan2(z, np.hypot(x, y))), "lon": np.degrees(np.arctan2(y, x))})
+
+
+def coordonnees(ref):
+    """
+    Table lat/lon indexée par nom : centroïde fourni pour chaque pays, centre
+    des centroïdes de ses pays pour chaque région du référentiel (un nom de
+    pays l'emporte sur un nom de région identique)
+    """
+    pays = ref.dropna(subset=["lat", "lon"])
+    regions = pays.groupby("Region")[["lat", "lon"]].apply(centroide)
+    return pays.drop_duplicates("Pays").set_index("Pays")[["lat", "lon"]].combine_first(regions)
+
+
+def empreinte_referentiel(ref):
+    """Empreinte du référentiel (le changer impose un nouveau nettoyage)"""
+    return f"{int(pd.util.hash_pandas_object(ref, index=False).sum()) % 2**64:016x}"
+
+
+def joindre_iso3(df, ref):
+    """
+    Ajoute la colonne ISO3 (category) après Pays, par jointure sur le nom.
+    Les fichiers qui ont déjà leur colonne ISO3 sont laissés tels quels.
+    """
+    if "Pays" not in df.columns or "ISO3" in df.columns:
+        return df
+    codes = ref.set_index("Pays")["ISO3"]
+    # Sur une colonne category, seule la liste des catégories est parcourue
+    iso3 = df["Pays"].map(codes).astype("category")
+    df = df.copy()
+    df.insert(df.columns.get_loc("Pays") + 1, "ISO3", iso3)
+    return df
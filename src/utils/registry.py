@@ -0,0 +1,103 @@
+# src/utils/registry.py
+"""
+Registre paresseux des datasets du dashboard.
+
+Le registre se lit comme un dictionnaire (df_dict["frequentation_region"]),
+mais chaque entrée n'est chargée qu'au premier accès puis conservée. Une page
+qui ne lit que le cube ne paie donc ni le chargement de frequentation_hoteliere
+ni celui de frequentation_mensuelle.
+"""
+import threading
+from collections.abc import Mapping
+
+import pyarrow.feather as feather
+
+from src.utils.aggregates import construire_cube, libelles_en_category
+from src.utils.clean_data import charger_manifest, cube_a_jour, cube_path, version_donnees
+from src.utils.disk_cache import cache_disque, df_vers_octets, empreinte, octets_vers_df
+from src.utils.load_cleaned_data import CLEANED_DIR, FILES, load_dataset
+from src.utils.query_engine import creer_moteur, localiser_regions
+from src.utils.schema import figer
+from src.utils.time_index import IndexMois
+
+
+class RegistreDatasets(Mapping):
+    """
+    Mapping {nom: DataFrame} dont les valeurs sont calculées à la demande.
+    `chargeurs` associe à chaque nom une fonction sans argument ; elle peut
+    elle-même lire d'autres entrées du registre (entrées dérivées comme le cube).
+    Un verrou par entrée évite les chargements concurrents entre sessions
+    Streamlit, qui partagent le même registre via st.cache_resource.
+    `version` identifie les données servies (clé des caches de figures).
+    """
+
+    def __init__(self, chargeurs, version=None):
+        self._chargeurs = dict(chargeurs)
+        self.version = version
+        self._valeurs = {}
+        self._verrous = {nom: threading.Lock() for nom in self._chargeurs}
+
+    def __getitem__(self, nom):
+        if nom not in self._chargeurs:
+            raise KeyError(nom)
+        try:
+            return self._valeurs[nom]
+        except KeyError:
+            pass
+        with self._verrous[nom]:
+            if nom not in self._valeurs:
+                self._valeurs[nom] = self._chargeurs[nom]()
+            return self._valeurs[nom]
+
+    def __iter__(self):
+        return iter(self._chargeurs)
+
+    def __len__(self):
+        return len(self._chargeurs)
+
+    def charges(self):
+        """Noms des entrées déjà chargées"""
+        return [nom for nom in self._chargeurs if nom in self._valeurs]
+
+    def __repr__(self):
+        return (f"{type(self).__name__}({len(self)} entrées, version={self.version!r}, "
+                f"chargées : {self.charges()})")
+
+
+def charger_cube(registre, cleaned_dir=CLEANED_DIR):
+    """
+    Cube d'agrégats : lu en memory-map depuis le cube persisté par clean_data
+    (tenu à jour mois par mois), ou relu depuis le cache disque s'il a déjà été
+    calculé pour cette version des données, sans charger frequentation_region
+    """
+    if cube_a_jour(charger_manifest(cleaned_dir), cleaned_dir):
+        return figer(libelles_en_category(feather.read_table(cube_path(cleaned_dir), memory_map=True).to_pandas()))
+
+    cache = cache_disque()
+    cle = empreinte("cube_region")
+    if cache is not None:
+        valeur = cache.get(cle, registre.version)
+        if valeur is not None:
+            return figer(octets_vers_df(valeur))
+
+    cube = construire_cube(registre["frequentation_region"])
+    if cache is not None:
+        cache.set(cle, registre.version, df_vers_octets(cube))
+    return figer(cube)
+
+
+def registre_dashboard(cleaned_dir=CLEANED_DIR, moteur="pandas"):
+    """
+    Registre des trois datasets nettoyés, du cube d'agrégats, de l'index des
+    mois de frequentation_region, du moteur de requêtes ("pandas" ou "duckdb", voir query_engine) utilisé par les pages
+    et des coordonnées des régions (calculées une fois par version des données)
+    """
+    chargeurs = {key: (lambda key=key: load_dataset(key, cleaned_dir)) for key in FILES}
+    registre = RegistreDatasets({
+        **chargeurs,
+        "cube_region": lambda: charger_cube(registre, cleaned_dir),
+        "index_mois": lambda: IndexMois.depuis_colonne(registre["frequentation_region"]["Mois"]),
+        "moteur": lambda: creer_moteur(moteur, registre, cleaned_dir),
+        "coords_regions": lambda: localiser_regions(registre["moteur"]),
+    }, version=version_donnees(cleaned_dir))
+    return registre
@@ -0,0 +1,210 @@
+# src/utils/schema.py
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+NUMERIC_COLS = ["Nombre de touristes", "Nombre de croisièristes",
+                "Nuitées touristiques", "Durée de séjour moyenne"]
+CATEGORICAL_COLS = ["Region", "Pays", "ISO3"]
+
+# Métadonnée des tables Arrow écrites déjà normalisées (types, tri et compactage définitifs)
+SCHEMA_NORMALISE = b"schema_normalise"
+
+
+def convertir_nombres(serie, decimal=","):
+    """
+    Conversion vectorisée d'une colonne texte au format français en float64.
+    Renvoie (valeurs, nombre d'échecs) : un échec est une valeur renseignée
+    mais non numérique, remplacée par NaN.
+    """
+    texte = serie.astype("str")
+    if decimal != ".":
+        texte = texte.str.replace(decimal, ".", regex=False)
+    valeurs = pd.to_numeric(texte.str.strip(), errors="coerce").astype("float64")
+    echecs = int((serie.notna() & valeurs.isna()).sum())
+    return valeurs, echecs
+
+
+def stats_conversion(df, echecs=None):
+    """Statistiques de conversion des indicateurs : valeurs manquantes et échecs de conversion"""
+    echecs = echecs or {}
+    return {
+        col: {"manquants": int(df[col].isna().sum()), "echecs": echecs.get(col, 0)}
+        for col in NUMERIC_COLS if col in df.columns
+    }
+
+
+def dtypes_csv(path, sep):
+    """Types appliqués dès la lecture : indicateurs en float64, le reste en texte"""
+    colonnes = pd.read_csv(path, sep=sep, nrows=0, encoding="utf-8").columns
+    return {col: "float64" if col in NUMERIC_COLS else "str" for col in colonnes}
+
+
+def lire_csv(path, sep=",", decimal=","):
+    """
+    Lecture d'un CSV avec conversion des indicateurs au moment du parsing
+    (decimal="," pour les fichiers bruts, "." pour les exports nettoyés).
+    Si une valeur n'est pas numérique, la colonne est relue en texte puis
+    convertie en une passe. Renvoie (DataFrame, statistiques de conversion).
+    """
+    dtypes = dtypes_csv(path, sep)
+    try:
+        df = pd.read_csv(path, sep=sep, decimal=decimal, dtype=dtypes, encoding="utf-8")
+        return df, stats_conversion(df)
+    except ValueError:
+        texte = {col: "str" for col in dtypes}
+        df = pd.read_csv(path, sep=sep, dtype=texte, encoding="utf-8")
+        return convertir_indicateurs(df, decimal)
+
+
+def lire_csv_blocs(path, sep=",", decimal=",", chunksize=500_000):
+    """Lecture par blocs : chaque bloc est lu en texte puis ses indicateurs convertis en une passe"""
+    texte = {col: "str" for col in dtypes_csv(path, sep)}
+    for bloc in pd.read_csv(path, sep=sep, dtype=texte, encoding="utf-8", chunksize=chunksize):
+        yield convertir_indicateurs(bloc, decimal)
+
+
+def convertir_indicateurs(df, decimal=","):
+    """Convertit les indicateurs texte d'un DataFrame. Renvoie (DataFrame, statistiques)"""
+    df = df.copy()
+    echecs = {}
+    for col in NUMERIC_COLS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col], echecs[col] = convertir_nombres(df[col], decimal)
+    return df, stats_conversion(df, echecs)
+
+
+def cumuler_stats(total, stats):
+    """Additionne des statistiques de conversion (lecture par blocs)"""
+    for col, valeurs in stats.items():
+        cumul = total.setdefault(col, {"manquants": 0, "echecs": 0})
+        for cle, n in valeurs.items():
+            cumul[cle] += n
+    return total
+
+
+def typer_colonnes(df):
+    """Applique les types définitifs : Mois en datetime, libellés en category, indicateurs numériques"""
+    df = df.copy()
+    if "Mois" in df.columns:
+        df["Mois"] = pd.to_datetime(df["Mois"])
+    if "Année" in df.columns:
+        df["Année"] = pd.to_numeric(df["Année"])
+    for col in NUMERIC_COLS:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            df[col], _ = convertir_nombres(df[col])
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def trier_par_mois(df):
+    """
+    Lignes triées par Mois croissant (tri stable) : les périodes deviennent des
+    tranches contiguës, sélectionnées par recherche dichotomique (voir IndexMois).
+    Renvoie df tel quel s'il est déjà trié.
+    """
+    if "Mois" not in df.columns or df["Mois"].is_monotonic_increasing:
+        return df
+    return df.sort_values("Mois", kind="stable", ignore_index=True)
+
+
+def empreinte_memoire(df):
+    """Taille du DataFrame en mémoire, en octets (libellés compris)"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _flottants_compacts(serie):
+    """Même colonne en entiers (valeurs entières sans NaN) ou en float32 si la conversion est exacte"""
+    valeurs = serie.to_numpy()
+    if len(valeurs) == 0:
+        return serie
+    if not np.isnan(valeurs).any() and np.array_equal(valeurs, np.trunc(valeurs)) \
+            and np.abs(valeurs).max() < 2**63:
+        return pd.to_numeric(serie.astype("int64"), downcast="integer")
+    if np.array_equal(valeurs.astype("float32").astype("float64"), valeurs, equal_nan=True):
+        return serie.astype("float32")
+    return serie
+
+
+def compacter(df):
+    """
+    Représentation compacte en mémoire, sans changer aucune valeur :
+    libellés texte répétés en category, entiers réduits au plus petit type,
+    flottants en entiers ou en float32 quand la conversion est exacte.
+    Renvoie (DataFrame, {"avant": octets, "apres": octets}).
+    """
+    avant = empreinte_memoire(df)
+    colonnes = {}
+    for col in df.columns:
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            pass
+        elif pd.api.types.is_string_dtype(serie.dtype):
+            if serie.nunique() < len(serie) / 2:
+                serie = serie.astype("category")
+        elif pd.api.types.is_integer_dtype(serie.dtype) and isinstance(serie.dtype, np.dtype):
+            serie = pd.to_numeric(serie, downcast="integer")
+        elif pd.api.types.is_float_dtype(serie.dtype) and isinstance(serie.dtype, np.dtype):
+            serie = _flottants_compacts(serie)
+        colonnes[col] = serie
+    df = pd.DataFrame(colonnes, index=df.index, copy=False)
+    return df, {"avant": avant, "apres": empreinte_memoire(df)}
+
+
+def figer(df):
+    """
+    Reconstruit le DataFrame sur des tableaux numpy en lecture seule :
+    toute écriture en place (loc/iloc) lève une erreur au lieu de modifier
+    la donnée partagée entre les sessions.
+    """
+    colonnes = {}
+    for col in df.columns:
+        serie = df[col]
+        if isinstance(serie.dtype, np.dtype):
+            valeurs = serie.to_numpy(copy=True)
+            valeurs.flags.writeable = False
+            colonnes[col] = valeurs
+        else:
+            colonnes[col] = serie.array
+    return pd.DataFrame(colonnes, index=df.index, copy=False)
+
+
+def normaliser_schema(df):
+    """
+    Étape de normalisation appliquée une seule fois au chargement :
+    les pages reçoivent des DataFrames déjà typés, triés par Mois, compactés, et
+    ne doivent jamais les modifier.
+    Renvoie (DataFrame, empreinte mémoire avant/après compactage).
+    """
+    df, memoire = compacter(trier_par_mois(typer_colonnes(df)))
+    return figer(df), memoire
+
+
+def table_normalisee(df):
+    """
+    Table Arrow d'un DataFrame issu de normaliser_schema, marquée comme telle :
+    relue par depuis_table sans être renormalisée
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), SCHEMA_NORMALISE: b"1"})
+
+
+def est_normalisee(table):
+    """Vrai si la table Arrow a été écrite par table_normalisee"""
+    return SCHEMA_NORMALISE in (table.schema.metadata or {})
+
+
+def depuis_table(table):
+    """
+    DataFrame normalisé d'une table Arrow. Une table marquée par table_normalisee
+    est convertie telle quelle, colonne par colonne, en libérant ses tampons au
+    fur et à mesure (self_destruct) : les colonnes numériques sont reprises sans
+    copie et, issues d'Arrow, déjà en lecture seule comme après figer.
+    Les autres passent par normaliser_schema.
+    Renvoie (DataFrame, empreinte mémoire avant/après compactage ou None).
+    """
+    if est_normalisee(table):
+        return table.to_pandas(split_blocks=True, self_destruct=True), None
+    return normaliser_schema(table.to_pandas())
@@ -0,0 +1,162 @@
+# src/utils/synthetic_data.py
+"""
+Générateur de jeux de données synthétiques au format des fichiers bruts
+(frequentation_region, frequentation_mensuelle, frequentation_hoteliere).
+
+Usage :
+    python -m src.utils.synthetic_data data/synthetique --pays 900 --mois 240 --seed 42
+
+Les fichiers respectent les schémas publiés, y compris la durée de séjour
+écrite avec une virgule décimale ("10,5"). Le résultat ne dépend que des
+paramètres et de la graine ; les lignes sont écrites par blocs de mois pour
+que la mémoire reste bornée même à plusieurs dizaines de millions de lignes.
+"""
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REGIONS = ["Amérique Centrale", "Amérique du Nord", "Amérique du Sud",
+           "Asie", "Europe", "Pacifique", "Autres Pays"]
+
+# Pays réels repris en premier, avec leur région et leur code ISO3
+PAYS_CONNUS = [
+    ("Canada", "Amérique du Nord", "CAN"),
+    ("États-Unis (y compris Hawaii)", "Amérique du Nord", "USA"),
+    ("France", "Europe", "FRA"),
+    ("Europe (hors France)", "Europe", ""),
+    ("Asie", "Asie", ""),
+    ("Amérique du Sud", "Amérique du Sud", ""),
+    ("Amérique Centrale", "Amérique Centrale", ""),
+    ("Pacifique", "Pacifique", ""),
+    ("Autres Pays", "Autres Pays", ""),
+]
+
+LIGNES_PAR_BLOC = 1_000_000
+MOIS_FIN = "2025-09-01"
+
+
+def referentiel_pays(n_pays, rng):
+    """Table des pays : nom, région, ISO3, taille de marché, durée et saisonnalité propres"""
+    noms, regions, iso3 = [], [], []
+    for i in range(n_pays):
+        if i < len(PAYS_CONNUS):
+            nom, region, code = PAYS_CONNUS[i]
+        else:
+            nom, region, code = f"Pays {i:05d}", REGIONS[rng.integers(len(REGIONS))], ""
+        noms.append(nom)
+        regions.append(region)
+        iso3.append(code)
+    return pd.DataFrame({
+        "Pays": noms,
+        "Region": regions,
+        "ISO3": iso3,
+        # Taille de marché très asymétrique (quelques gros émetteurs)
+        "base": rng.lognormal(mean=6.0, sigma=1.3, size=n_pays),
+        "duree": rng.lognormal(mean=np.log(13), sigma=0.25, size=n_pays),
+        "part_croisiere": rng.beta(2, 8, size=n_pays),
+        "phase": rng.uniform(-1, 1, size=n_pays),
+    })
+
+
+def liste_mois(n_mois, fin=MOIS_FIN):
+    """Mois du plus récent au plus ancien, comme dans les fichiers publiés"""
+    return pd.date_range(end=fin, periods=n_mois, freq="MS")[::-1]
+
+
+def format_virgule(valeurs, decimales=1):
+    """Nombres au format français : "10,5", et "9" pour les valeurs entières"""
+    echelle = 10 ** decimales
+    entiers = np.round(np.asarray(valeurs) * echelle).astype(np.int64)
+    partie_ent = pd.Series(entiers // echelle).astype(str)
+    partie_dec = pd.Series(entiers % echelle).astype(str).str.zfill(decimales).str.rstrip("0")
+    return partie_ent.where(partie_dec == "", partie_ent + "," + partie_dec)
+
+
+def generer_bloc(pays, mois, rng):
+    """Lignes de frequentation_region pour un bloc de mois (tous les pays)"""
+    n_pays, n_mois = len(pays), len(mois)
+    idx_pays = np.tile(np.arange(n_pays), n_mois)
+    idx_mois = np.repeat(np.arange(n_mois), n_pays)
+    mois_vals = mois[idx_mois]
+
+    # Saisonnalité (pic estival décalé par pays), tendance lente et bruit multiplicatif
+    saison = 1 + 0.45 * np.cos(2 * np.pi * (mois_vals.month.to_numpy() - 7) / 12
+                               + pays["phase"].to_numpy()[idx_pays] * 0.5)
+    tendance = 1 + 0.02 * (mois_vals.year.to_numpy() - 2015)
+    bruit = rng.lognormal(mean=0, sigma=0.15, size=len(idx_pays))
+    touristes = np.maximum(1, np.round(pays["base"].to_numpy()[idx_pays] * saison * tendance * bruit))
+
+    croisieristes = np.round(touristes * pays["part_croisiere"].to_numpy()[idx_pays]
+                             * rng.uniform(0.5, 1.5, size=len(idx_pays)))
+    duree = np.maximum(1, pays["duree"].to_numpy()[idx_pays]
+                       * rng.lognormal(mean=0, sigma=0.2, size=len(idx_pays)))
+    nuitees = np.round(touristes * duree)
+
+    return pd.DataFrame({
+        "Mois": mois_vals.strftime("%Y-%m-%d"),
+        "Region": pays["Region"].to_numpy()[idx_pays],
+        "Pays": pays["Pays"].to_numpy()[idx_pays],
+        "Nombre de touristes": touristes.astype(np.int64),
+        "Nombre de croisièristes": croisieristes.astype(np.int64),
+        "Nuitées touristiques": nuitees.astype(np.int64),
+        "Durée de séjour moyenne": format_virgule(duree).to_numpy(),
+    })
+
+
+def generer_jeu(dest, n_pays=9, n_mois=222, seed=0, lignes_par_bloc=LIGNES_PAR_BLOC):
+    """
+    Écrit les trois fichiers bruts dans `dest` et renvoie le nombre de lignes de
+    frequentation_region (n_pays × n_mois). frequentation_mensuelle et
+    frequentation_hoteliere sont cohérents avec les lignes générées.
+    """
+    dest = Path(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    pays = referentiel_pays(n_pays, rng)
+    mois = liste_mois(n_mois)
+
+    mois_par_bloc = max(1, lignes_par_bloc // n_pays)
+    mensuel, annuel = [], []
+    path_region = dest / "frequentation_region.csv"
+    for i, debut in enumerate(range(0, n_mois, mois_par_bloc)):
+        bloc = generer_bloc(pays, mois[debut:debut + mois_par_bloc], rng)
+        bloc.to_csv(path_region, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+
+        mesures = bloc[["Nombre de touristes", "Nombre de croisièristes", "Nuitées touristiques"]]
+        mensuel.append(mesures.groupby(bloc["Mois"], sort=False).sum())
+        annuel.append(mesures.groupby([bloc["Mois"].str[:4].astype(int), bloc["Pays"]], sort=False).sum())
+
+    # Totaux mensuels
+    df_mensuel = pd.concat(mensuel).reset_index()
+    df_mensuel["Durée de séjour moyenne"] = format_virgule(
+        df_mensuel["Nuitées touristiques"] / df_mensuel["Nombre de touristes"], decimales=2
+    )
+    df_mensuel.to_csv(dest / "frequentation_mensuelle.csv", index=False)
+
+    # Totaux annuels par pays (durée cumulée sur l'année, comme le fichier publié)
+    df_annuel = pd.concat(annuel).groupby(level=[0, 1], sort=False).sum().reset_index()
+    df_annuel.columns = ["Année", "Pays"] + list(df_annuel.columns[2:])
+    df_annuel = df_annuel.merge(pays[["Pays", "Region", "ISO3"]], on="Pays")
+    df_annuel["Durée de séjour moyenne"] = format_virgule(
+        12 * df_annuel["Nuitées touristiques"] / df_annuel["Nombre de touristes"]
+    )
+    df_annuel = df_annuel.sort_values(["Année", "Region", "Pays"], ascending=[False, True, True])
+    df_annuel[["Année", "Region", "Pays", "ISO3", "Nombre de touristes", "Nombre de croisièristes",
+               "Nuitées touristiques", "Durée de séjour moyenne"]].to_csv(
+        dest / "frequentation_hoteliere.csv", index=False
+    )
+
+    return n_pays * n_mois
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Génère des fichiers bruts synthétiques")
+    parser.add_argument("dest", help="répertoire de sortie")
+    parser.add_argument("--pays", type=int, default=9, help="nombre de pays")
+    parser.add_argument("--mois", type=int, default=222, help="nombre de mois d'historique")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    n = generer_jeu(args.dest, args.pays, args.mois, args.seed)
+    print(f"{n} lignes générées dans {args.dest}")
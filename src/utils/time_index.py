@@ -0,0 +1,57 @@
+# src/utils/time_index.py
+"""
+Index des mois d'une table triée par Mois.
+
+Pour chaque mois distinct, on garde la position de sa première ligne. Une
+période (debut, fin) ou une année se traduit alors en deux recherches
+dichotomiques sur la liste des mois, et la sélection est une tranche iloc
+contiguë : ni masque booléen sur toutes les lignes, ni copie des données.
+Les listes d'options des filtres (mois au format "AAAA-MM", années) sont
+calculées une fois avec l'index.
+"""
+import numpy as np
+import pandas as pd
+
+
+class IndexMois:
+    """
+    `mois` : mois distincts triés (datetime64), `debuts` : position de la
+    première ligne de chaque mois, suivie du nombre total de lignes indexées.
+    """
+
+    def __init__(self, mois, debuts):
+        self.mois = pd.DatetimeIndex(mois)
+        self.debuts = np.asarray(debuts, dtype=np.int64)
+        self.dates = [str(periode) for periode in self.mois.to_period("M")]
+        self.annees = sorted(set(self.mois.year.tolist()))
+
+    @classmethod
+    def depuis_colonne(cls, colonne):
+        """Index d'une colonne Mois triée (les NaT, rangés en fin par le tri, ne sont jamais sélectionnés)"""
+        valeurs = colonne.dropna().to_numpy(dtype="datetime64[ns]")
+        if np.any(valeurs[1:] < valeurs[:-1]):
+            raise ValueError("La colonne Mois doit être triée (voir trier_par_mois)")
+        if len(valeurs) == 0:
+            return cls(valeurs, [0])
+        ruptures = np.flatnonzero(valeurs[1:] != valeurs[:-1]) + 1
+        debuts = np.concatenate([[0], ruptures, [len(valeurs)]])
+        return cls(valeurs[debuts[:-1]], debuts)
+
+    def bornes(self, debut=None, fin=None, annee=None):
+        """Positions [a, b) des lignes de la période (bornes incluses) et de l'année demandées"""
+        bas, haut = 0, len(self.mois)
+        if debut is not None:
+            bas = max(bas, self.mois.searchsorted(pd.Timestamp(debut), side="left"))
+        if fin is not None:
+            haut = min(haut, self.mois.searchsorted(pd.Timestamp(fin), side="right"))
+        if annee is not None:
+            bas = max(bas, self.mois.searchsorted(pd.Timestamp(int(annee), 1, 1), side="left"))
+            haut = min(haut, self.mois.searchsorted(pd.Timestamp(int(annee) + 1, 1, 1), side="left"))
+        if bas >= haut:
+            return 0, 0
+        return int(self.debuts[bas]), int(self.debuts[haut])
+
+    def tranche(self, df, debut=None, fin=None, annee=None):
+        """Vue sur les lignes de df (la table indexée) couvrant la période"""
+        a, b = self.bornes(debut, fin, annee)
+        return df.iloc[a:b]
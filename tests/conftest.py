@@ -0,0 +1,29 @@
+# tests/conftest.py
+"""Fixtures partagées : dossiers brut/nettoyé temporaires pour src/utils/clean_data"""
+import pandas as pd
+import pytest
+
+from src.utils import clean_data
+
+REGION = clean_data.CUBE_SOURCE
+
+
+@pytest.fixture
+def brut():
+    """Fichier brut frequentation_region livré avec le dépôt, en texte"""
+    return pd.read_csv(clean_data.RAW_DIR / REGION, dtype=str)
+
+
+@pytest.fixture
+def dossiers(tmp_path, monkeypatch):
+    """
+    Dossiers brut et nettoyé vides, limités à frequentation_region (source du cube).
+    Le cache disque est désactivé : la purge viserait le cache du dépôt.
+    """
+    raw, cleaned = tmp_path / "raw", tmp_path / "cleaned"
+    raw.mkdir()
+    cleaned.mkdir()
+    monkeypatch.setattr(clean_data, "FILES", {REGION: "frequentation_region_cleaned.csv"})
+    monkeypatch.setattr(clean_data, "cache_disque", lambda: None)
+    return raw, cleaned
+
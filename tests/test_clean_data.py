@@ -0,0 +1,130 @@
+# tests/test_clean_data.py
+"""Nettoyage (src/utils/clean_data) : empreintes des lignes vues et mode streaming"""
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+from src.utils import clean_data
+from src.utils.clean_data import EmpreintesVues, clean_tourism_data, store_path
+from src.utils.load_cleaned_data import load_dataset
+from src.utils.schema import est_normalisee, normaliser_schema
+
+REGION = clean_data.CUBE_SOURCE
+CLEANED = "frequentation_region_cleaned.csv"
+
+
+def empreintes(df):
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def store(cleaned):
+    return normaliser_schema(pd.read_feather(store_path(CLEANED, cleaned)))[0]
+
+
+def test_fusion_par_fenetres(monkeypatch):
+    monkeypatch.setattr(clean_data, "FENETRE_FUSION", 3)
+    rng = np.random.default_rng(0)
+    vues = EmpreintesVues(capacite=4)
+    attendu = np.empty(0, dtype=np.uint64)
+    for taille in [5, 1, 17, 0, 40, 9]:
+        bloc = pd.DataFrame({"x": rng.integers(0, 60, taille)})
+        nouvelles = vues.filtrer(bloc)
+        # Lignes jamais vues, chacune une seule fois
+        assert not np.isin(empreintes(nouvelles), attendu).any()
+        assert not nouvelles.duplicated().any()
+        attendu = np.union1d(attendu, empreintes(bloc))
+        np.testing.assert_array_equal(vues.vues, attendu)
+    assert len(vues._tampon) > 4
+
+
+def test_doublons_entre_blocs():
+    df = pd.DataFrame({"Mois": list("aabcdbea"), "n": [1, 1, 2, 3, 4, 2, 5, 9]})
+    vues = EmpreintesVues()
+    blocs = [vues.filtrer(df.iloc[i:i + 3]) for i in range(0, len(df), 3)]
+    pd.testing.assert_frame_equal(pd.concat(blocs), df.drop_duplicates())
+
+
+def test_streaming_egal_en_memoire(dossiers, brut, tmp_path):
+    raw, cleaned = dossiers
+    # Doublons dans un même bloc et d'un bloc à l'autre
+    pd.concat([brut, brut.iloc[::7], brut.iloc[:5]]).to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+    flux = tmp_path / "flux"
+    clean_tourism_data(raw, flux, chunksize=300)
+
+    pd.testing.assert_frame_equal(store(flux), store(cleaned),
+                                  check_dtype=False, check_categorical=False)
+    en_memoire = clean_data.charger_manifest(cleaned)["files"][REGION]
+    streaming = clean_data.charger_manifest(flux)["files"][REGION]
+    assert streaming["partitions"] == en_memoire["partitions"]
+    assert streaming["cleaned_rows"] == en_memoire["cleaned_rows"] == len(brut.drop_duplicates())
+
+
+def test_streaming_interrompu(dossiers, brut, monkeypatch):
+    raw, cleaned = dossiers
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned, chunksize=300)
+    fichiers = {p.name: p.read_bytes() for p in cleaned.iterdir()}
+
+    brut.iloc[::2].to_csv(raw / REGION, sep=";", index=False)
+    typer = clean_data.typer_colonnes
+    appels = []
+
+    def typer_puis_echouer(df):
+        appels.append(len(df))
+        if len(appels) == 3:
+            raise KeyboardInterrupt
+        return typer(df)
+
+    monkeypatch.setattr(clean_data, "typer_colonnes", typer_puis_echouer)
+    with pytest.raises(KeyboardInterrupt):
+        clean_tourism_data(raw, cleaned, chunksize=300)
+
+    # Store, export, cube et manifeste précédents intacts, aucun .tmp laissé
+    assert {p.name: p.read_bytes() for p in cleaned.iterdir()} == fichiers
+
+
+def test_partitions_incrementales(dossiers, brut, tmp_path, capsys):
+    raw, cleaned = dossiers
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+    arrow = store_path(CLEANED, cleaned)
+    avant = arrow.stat().st_mtime_ns
+
+    # Fichier inchangé : ignoré, store non réécrit
+    capsys.readouterr()
+    clean_tourism_data(raw, cleaned)
+    assert "Inchangé depuis le dernier nettoyage, ignoré" in capsys.readouterr().out
+    assert arrow.stat().st_mtime_ns == avant
+
+    # Un mois modifié : seule sa partition est re-nettoyée
+    modifie = brut.copy()
+    modifie.loc[modifie.index[modifie["Mois"] == "2012-03-01"][0], "Nombre de touristes"] = "999"
+    modifie.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+    nb = len(brut.drop_duplicates()["Mois"].unique())
+    assert f"Partitions: 1 à nettoyer, 0 supprimées, {nb - 1} inchangées" in capsys.readouterr().out
+
+    complet = tmp_path / "complet"
+    clean_tourism_data(raw, complet)
+    pd.testing.assert_frame_equal(store(cleaned), store(complet))
+    assert (clean_data.charger_manifest(cleaned)["files"][REGION]["partitions"]
+            == clean_data.charger_manifest(complet)["files"][REGION]["partitions"])
+
+
+def test_store_normalise(dossiers, brut, tmp_path):
+    raw, cleaned = dossiers
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+    flux = tmp_path / "flux"
+    clean_tourism_data(raw, flux, chunksize=300)
+
+    # Store écrit normalisé, relu tel quel ; le store du streaming est normalisé au chargement
+    assert est_normalisee(feather.read_table(store_path(CLEANED, cleaned)))
+    assert not est_normalisee(feather.read_table(store_path(CLEANED, flux)))
+    df = load_dataset("frequentation_region", cleaned)
+    pd.testing.assert_frame_equal(df, load_dataset("frequentation_region", flux))
+    assert df["Mois"].is_monotonic_increasing
+    with pytest.raises(ValueError):
+        df.iloc[0, df.columns.get_loc("Nombre de touristes")] = 0
@@ -0,0 +1,69 @@
+# tests/test_cube.py
+"""Cube d'agrégats persisté (clean_data.maintenir_cube) : mise à jour mois par mois"""
+import pandas as pd
+import pyarrow.feather as feather
+import pytest
+
+from src.utils import clean_data
+from src.utils.aggregates import construire_cube, libelles_en_category
+from src.utils.clean_data import clean_tourism_data, cube_path
+from src.utils.load_cleaned_data import load_dataset
+
+REGION = clean_data.CUBE_SOURCE
+
+
+@pytest.fixture(autouse=True)
+def petites_tranches(monkeypatch):
+    """Plusieurs tranches de mois, réparties en plusieurs passes sur le store"""
+    monkeypatch.setattr(clean_data, "CHUNKSIZE", 200)
+    monkeypatch.setattr(clean_data, "CUBE_FICHIERS_OUVERTS", 3)
+
+
+def verifier_cube(cleaned):
+    """Le cube persisté est celui construit en entier à partir du store"""
+    cube = libelles_en_category(feather.read_table(cube_path(cleaned)).to_pandas())
+    complet = construire_cube(load_dataset("frequentation_region", cleaned))
+    pd.testing.assert_frame_equal(cube, complet, check_categorical=False)
+
+
+def test_nouveaux_mois(dossiers, brut, capsys):
+    raw, cleaned = dossiers
+    brut[brut["Mois"] < "2025-09-01"].to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+    verifier_cube(cleaned)
+
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    capsys.readouterr()
+    clean_tourism_data(raw, cleaned)
+    assert "1 mois recalculés, 0 supprimés" in capsys.readouterr().out
+    verifier_cube(cleaned)
+
+
+def test_mois_modifie_et_supprime(dossiers, brut, capsys):
+    raw, cleaned = dossiers
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+
+    modifie = brut[brut["Mois"] != "2010-05-01"].copy()
+    modifie.loc[modifie.index[modifie["Mois"] == "2012-03-01"][0], "Nombre de touristes"] = "999"
+    modifie.to_csv(raw / REGION, sep=";", index=False)
+    capsys.readouterr()
+    clean_tourism_data(raw, cleaned)
+    assert "1 mois recalculés, 1 supprimés" in capsys.readouterr().out
+    verifier_cube(cleaned)
+
+
+@pytest.mark.parametrize("changement", ["pipeline", "referentiel"])
+def test_reconstruction_complete(dossiers, brut, capsys, monkeypatch, changement):
+    raw, cleaned = dossiers
+    brut.to_csv(raw / REGION, sep=";", index=False)
+    clean_tourism_data(raw, cleaned)
+
+    if changement == "pipeline":
+        monkeypatch.setattr(clean_data, "PIPELINE_VERSION", clean_data.PIPELINE_VERSION + 1)
+    else:
+        monkeypatch.setattr(clean_data, "empreinte_referentiel", lambda referentiel: "autre")
+    capsys.readouterr()
+    clean_tourism_data(raw, cleaned)
+    assert "Cube d'agrégats : construction complète" in capsys.readouterr().out
+    verifier_cube(cleaned)
@@ -0,0 +1,119 @@
+# tests/test_get_data.py
+"""Téléchargement (src/utils/get_data) contre un serveur HTTP local"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils import get_data
+
+CONTENU = b"Mois;Region;Pays\n" + b"2024-01-01;Europe;Allemagne\n" * 40
+ETAG = '"v1"'
+
+
+class Serveur(BaseHTTPRequestHandler):
+    """
+    Serveur du fichier CONTENU. Comportements réglés par le serveur :
+    `echecs` réponses 503 d'abord, puis `tronques` réponses coupées après
+    `coupure` octets (longueur complète annoncée).
+    """
+
+    def do_GET(self):
+        serveur = self.server
+        serveur.requetes.append(dict(self.headers))
+        if serveur.echecs > 0:
+            serveur.echecs -= 1
+            self.send_error(503)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        debut = 0
+        plage = self.headers.get("Range")
+        if plage and self.headers.get("If-Range") == ETAG:
+            debut = int(plage.split("=")[1].rstrip("-"))
+        corps = CONTENU[debut:]
+        self.send_response(206 if debut else 200)
+        if debut:
+            self.send_header("Content-Range", f"bytes {debut}-{len(CONTENU) - 1}/{len(CONTENU)}")
+        self.send_header("Content-Length", str(len(corps)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        if serveur.tronques > 0:
+            serveur.tronques -= 1
+            corps = corps[:serveur.coupure]
+            self.close_connection = True
+        self.wfile.write(corps)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serveur():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Serveur)
+    httpd.requetes, httpd.echecs, httpd.tronques, httpd.coupure = [], 0, 0, 300
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(httpd):
+    return f"http://127.0.0.1:{httpd.server_address[1]}/fichier.csv"
+
+
+def test_telechargement_puis_304(serveur, tmp_path):
+    urls = {"fichier": url(serveur)}
+    resultats = get_data.load_raw_data(urls, str(tmp_path), backoff=0)
+    assert resultats["fichier"]["statut"] == "telecharge"
+    assert (tmp_path / "fichier.csv").read_bytes() == CONTENU
+
+    resultats = get_data.load_raw_data(urls, str(tmp_path), backoff=0)
+    assert resultats["fichier"]["statut"] == "inchange"
+    assert serveur.requetes[-1]["If-None-Match"] == ETAG
+
+
+def test_nouvelles_tentatives_avec_backoff(serveur, tmp_path, monkeypatch):
+    attentes = []
+    monkeypatch.setattr(get_data.time, "sleep", attentes.append)
+    serveur.echecs = 2
+    resultat = get_data.telecharger("fichier", url(serveur), str(tmp_path), backoff=0.5)
+    assert resultat["statut"] == "telecharge"
+    assert attentes == [0.5, 1.0]
+    assert (tmp_path / "fichier.csv").read_bytes() == CONTENU
+
+
+def test_reponse_tronquee_sans_validateurs(serveur, tmp_path):
+    serveur.tronques = 1
+    with pytest.raises(get_data.TelechargementIncomplet):
+        get_data.load_raw_data({"fichier": url(serveur)}, str(tmp_path), retries=0)
+    assert not (tmp_path / "fichier.csv").exists()
+    assert (tmp_path / "fichier.csv.part").stat().st_size == serveur.coupure
+    # Aucun validateur enregistré : le prochain lancement ne recevra pas de 304
+    cache = json.loads((tmp_path / get_data.HTTP_CACHE_FILE).read_text(encoding="utf-8"))
+    assert "fichier" not in cache
+
+
+def test_reprise_entre_deux_lancements(serveur, tmp_path):
+    serveur.tronques = 1
+    with pytest.raises(get_data.TelechargementIncomplet):
+        get_data.telecharger("fichier", url(serveur), str(tmp_path), retries=0)
+
+    resultat = get_data.telecharger("fichier", url(serveur), str(tmp_path), retries=0)
+    assert resultat["statut"] == "telecharge"
+    assert serveur.requetes[-1]["Range"] == f"bytes={serveur.coupure}-"
+    assert (tmp_path / "fichier.csv").read_bytes() == CONTENU
+    assert not os.path.exists(tmp_path / "fichier.csv.part")
+    assert not os.path.exists(tmp_path / "fichier.csv.part.json")
+
+
+def test_reprise_apres_troncature_dans_le_meme_lancement(serveur, tmp_path):
+    serveur.tronques = 1
+    resultat = get_data.telecharger("fichier", url(serveur), str(tmp_path), backoff=0)
+    assert resultat["taille"] == len(CONTENU)
+    assert (tmp_path / "fichier.csv").read_bytes() == CONTENU